@@ -96,6 +96,8 @@ def move_zeroes(arr):
 
 # 4. LINKED LIST (SLOW-FAST POINTERS): Floyd's Cycle Detection
 class ListNode:
+    __slots__ = ('val', 'next')
+
     def __init__(self, val=0, next=None):
         self.val = val
         self.next = next
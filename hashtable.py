@@ -2,56 +2,440 @@
 Hash Table Examples: Simple to Complex
 """
 
+import abc
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import mmap
+import os
+import pickle
+import random
+import struct
+import tempfile
+import threading
+import time
+import tracemalloc
+
 # ============================================================================
-# 1. SIMPLE HASH TABLE - Manual Implementation with Linear Probing
+# BULK OPERATIONS - Shared by Every Table
 # ============================================================================
 
-class SimpleHashTable:
-    """Basic hash table with linear probing for collision handling"""
-    
+def _materialize(items):
+    """Turn a one-shot iterable into a list so its length is known up front"""
+    if isinstance(items, (list, tuple)):
+        return items
+    return list(items)
+
+
+class BulkOperationsMixin:
+    """Batched insert/search/delete built on a table's single-key methods.
+
+    Tables pre-size themselves through `_reserve(n)` before a batch insert,
+    so loading n pairs triggers at most one resize. Tables with a faster
+    native path override the batch methods.
+    """
+
+    @classmethod
+    def _size_for(cls, n):
+        """Constructor size that holds n entries without resizing"""
+        return max(n, 1)
+
+    def _reserve(self, n):
+        """Make room for n live entries; fixed-size tables ignore this"""
+
+    def insert_many(self, pairs):
+        """Insert (key, value) pairs; later duplicates win"""
+        pairs = _materialize(pairs)
+        self._reserve(self.count + len(pairs))
+        insert = self.insert
+        for key, value in pairs:
+            insert(key, value)
+
+    def search_many(self, keys):
+        """Search every key, returning results in input order"""
+        search = self.search
+        return [search(key) for key in keys]
+
+    def delete_many(self, keys):
+        """Delete every key, returning each delete() result in input order"""
+        delete = self.delete
+        return [delete(key) for key in keys]
+
+    @classmethod
+    def from_pairs(cls, pairs, **kwargs):
+        """Build a table sized for all pairs in a single pass.
+
+        Extra keyword arguments go to the constructor, e.g.
+        DynamicHashTable.from_pairs(pairs, incremental=True).
+        """
+        pairs = _materialize(pairs)
+        table = cls(cls._size_for(len(pairs)), **kwargs)
+        table.insert_many(pairs)
+        return table
+
+    def save(self, path, allow_pickle=False):
+        """Write the table to disk in the MappedHashTable file format"""
+        MappedHashTable.save(self, path, allow_pickle=allow_pickle)
+
+
+# ============================================================================
+# INSTRUMENTATION - Probe/Chain Histograms, Resize and Operation Timing
+# ============================================================================
+
+class TableStats:
+    """Counters collected while a table has stats enabled"""
+
+    def __init__(self):
+        self.op_counts = Counter()
+        self.total_ns = Counter()
+        self.max_ns = Counter()
+        # Latencies bucketed by power of two: bucket b holds [2**(b-1), 2**b) ns
+        self.latency_histogram = {}
+        self.probe_histogram = Counter()
+        self.max_probe = 0
+        self.resizes = 0
+        self.resize_ns = 0
+        self.max_resize_ns = 0
+        # Sampling state: `armed` means the next operation is measured
+        self.sampled = False
+        self.armed = False
+        self.stopped = threading.Event()
+
+    def record_op(self, op, ns, probes):
+        self.op_counts[op] += 1
+        self.total_ns[op] += ns
+        if ns > self.max_ns[op]:
+            self.max_ns[op] = ns
+        self.latency_histogram.setdefault(op, Counter())[ns.bit_length()] += 1
+        self.probe_histogram[probes] += 1
+        if probes > self.max_probe:
+            self.max_probe = probes
+
+    def record_resize(self, ns):
+        self.resizes += 1
+        self.resize_ns += ns
+        if ns > self.max_resize_ns:
+            self.max_resize_ns = ns
+
+    def snapshot(self):
+        return {
+            'ops': dict(self.op_counts),
+            'avg_ns': {op: self.total_ns[op] / n for op, n in self.op_counts.items()},
+            'max_ns': dict(self.max_ns),
+            'latency_log2_histogram': {op: dict(h) for op, h in self.latency_histogram.items()},
+            'probe_histogram': dict(self.probe_histogram),
+            'max_probe': self.max_probe,
+            'resizes': self.resizes,
+            'resize_ms_total': self.resize_ns / 1e6,
+            'resize_ms_max': self.max_resize_ns / 1e6,
+        }
+
+
+def _records_resize(method):
+    """Time a resize method into the table's stats when they are enabled"""
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        stats = self.stats
+        if stats is None:
+            return method(self, *args)
+        start = time.perf_counter_ns()
+        result = method(self, *args)
+        stats.record_resize(time.perf_counter_ns() - start)
+        return result
+    return wrapper
+
+
+class InstrumentationMixin(abc.ABC):
+    """Opt-in stats for a table.
+
+    Every insert/search/delete starts with one `self.stats` check, so a
+    table without stats pays a single attribute load. With sample_interval
+    set, a daemon thread arms the stats once per interval and only the next
+    operation is measured, keeping overhead negligible; op counts then
+    describe the sampled calls only.
+    """
+
+    stats = None
+
+    @abc.abstractmethod
+    def _probe_length(self, key):
+        """Slots or nodes a lookup of key examines"""
+
+    @abc.abstractmethod
+    def _layout_lengths(self):
+        """Chain length per bucket, or probe length per entry"""
+
+    def _instrumented_call(self, op, key, *args):
+        """Run one operation with stats disarmed, recording time and probes"""
+        stats = self.stats
+        stats.armed = False
+        # A delete removes the key, so measure its probe path beforehand
+        probes = self._probe_length(key) if op == 'delete' else 0
+        start = time.perf_counter_ns()
+        try:
+            return getattr(self, op)(key, *args)
+        finally:
+            ns = time.perf_counter_ns() - start
+            if op != 'delete':
+                probes = self._probe_length(key)
+            stats.record_op(op, ns, probes)
+            stats.armed = not stats.sampled
+
+    def enable_stats(self, sample_interval=None):
+        self.disable_stats()
+        stats = self.stats = TableStats()
+        stats.sampled = sample_interval is not None
+        stats.armed = not stats.sampled
+        if sample_interval is None:
+            return stats
+
+        def arm():
+            while not stats.stopped.wait(sample_interval):
+                stats.armed = True
+
+        threading.Thread(target=arm, name="hashtable-stats-sampler", daemon=True).start()
+        return stats
+
+    def disable_stats(self):
+        if self.stats is not None:
+            self.stats.armed = False
+            self.stats.stopped.set()
+        self.stats = None
+
+    def chain_histogram(self):
+        """Histogram of the current layout's chain or probe lengths"""
+        return Counter(self._layout_lengths())
+
+    def get_stats(self):
+        """Table shape plus any collected operation stats"""
+        histogram = self.chain_histogram()
+        report = {
+            'size': self.size,
+            'entries': self.count,
+            'load_factor': self.count / self.size,
+            'max_chain': max(histogram, default=0),
+            'chain_histogram': dict(sorted(histogram.items())),
+        }
+        if self.stats is not None:
+            report.update(self.stats.snapshot())
+        return report
+
+
+# ============================================================================
+# 1. SIMPLE HASH TABLE - Open Addressing with Robin Hood Probing
+# ============================================================================
+
+# Slot markers for open addressing
+_EMPTY = object()
+_TOMBSTONE = object()
+
+
+class SimpleHashTable(BulkOperationsMixin, InstrumentationMixin):
+    """Open-addressing hash table with Robin Hood probing and tombstones.
+
+    Each slot caches the full hash of its key, so probe distances and
+    resizes never call hash() again. The capacity is always a power of two.
+    """
+
+    MAX_LOAD = 0.75      # grow when live + deleted slots exceed this
+    MIN_LOAD = 0.20      # shrink when live entries drop below this
+    MIN_SIZE = 8
+
     def __init__(self, size=10):
+        self.size = self._round_up(size)
+        self.count = 0
+        self.tombstones = 0
+        self._alloc(self.size)
+
+    @classmethod
+    def _round_up(cls, n):
+        size = cls.MIN_SIZE
+        while size < n:
+            size *= 2
+        return size
+
+    def _alloc(self, size):
         self.size = size
-        self.table = [None] * size
-    
+        self._mask = size - 1
+        self._hashes = [0] * size
+        self._keys = [_EMPTY] * size
+        self._values = [None] * size
+
     def hash_function(self, key):
-        """Simple hash function"""
-        return hash(key) % self.size
-    
+        """Home slot of a key"""
+        return hash(key) & self._mask
+
+    def _find(self, key, h):
+        """Return the slot holding key, or -1"""
+        mask = self._mask
+        keys = self._keys
+        hashes = self._hashes
+        index = h & mask
+        dist = 0
+
+        while True:
+            k = keys[index]
+            if k is _EMPTY:
+                return -1
+            # Robin Hood invariant: a slot closer to its home than we are to
+            # ours means the key would have displaced it, so it is absent.
+            # Tombstones keep the hash of the deleted key to preserve this.
+            if ((index - hashes[index]) & mask) < dist:
+                return -1
+            if k is not _TOMBSTONE and hashes[index] == h and (k is key or k == key):
+                return index
+            index = (index + 1) & mask
+            dist += 1
+
+    def _place(self, h, key, value):
+        """Insert a key known to be absent, displacing richer entries"""
+        mask = self._mask
+        keys = self._keys
+        hashes = self._hashes
+        values = self._values
+        index = h & mask
+        dist = 0
+
+        while True:
+            k = keys[index]
+            if k is _EMPTY:
+                hashes[index], keys[index], values[index] = h, key, value
+                return
+            slot_dist = (index - hashes[index]) & mask
+            if k is _TOMBSTONE and slot_dist <= dist:
+                # Reusing a tombstone never lowers the slot's probe distance
+                hashes[index], keys[index], values[index] = h, key, value
+                self.tombstones -= 1
+                return
+            if k is not _TOMBSTONE and slot_dist < dist:
+                # Steal from the rich: swap and keep inserting the evicted entry
+                hashes[index], h = h, hashes[index]
+                keys[index], key = key, keys[index]
+                values[index], value = value, values[index]
+                dist = slot_dist
+            index = (index + 1) & mask
+            dist += 1
+
+    @classmethod
+    def _size_for(cls, n):
+        return cls._round_up(int(n / cls.MAX_LOAD) + 1)
+
+    def _reserve(self, n):
+        if n + self.tombstones > self.size * self.MAX_LOAD:
+            self._resize(self._size_for(n))
+
+    @_records_resize
+    def _resize(self, new_size):
+        """Rehash live entries into a new table, dropping tombstones"""
+        old = zip(self._hashes, self._keys, self._values)
+        self._alloc(new_size)
+        self.tombstones = 0
+        for h, k, v in old:
+            if k is not _EMPTY and k is not _TOMBSTONE:
+                self._place(h, k, v)
+
     def insert(self, key, value):
         """Insert key-value pair"""
-        index = self.hash_function(key)
-        
-        # Linear probing for collision handling
-        while self.table[index] is not None:
-            if self.table[index][0] == key:
-                self.table[index] = (key, value)
-                return
-            index = (index + 1) % self.size
-        
-        self.table[index] = (key, value)
-    
+        if self.stats is not None and self.stats.armed:
+            return self._instrumented_call('insert', key, value)
+        h = hash(key)
+        index = self._find(key, h)
+        if index >= 0:
+            self._values[index] = value
+            return
+
+        if self.count + self.tombstones + 1 > self.size * self.MAX_LOAD:
+            # Mostly tombstones: clean up in place instead of growing
+            if self.count + 1 > self.size * self.MAX_LOAD / 2:
+                self._resize(self.size * 2)
+            else:
+                self._resize(self.size)
+
+        self._place(h, key, value)
+        self.count += 1
+
     def search(self, key):
         """Search for a key"""
-        index = self.hash_function(key)
-        
-        while self.table[index] is not None:
-            if self.table[index][0] == key:
-                return self.table[index][1]
-            index = (index + 1) % self.size
-        
-        return None
-    
+        if self.stats is not None and self.stats.armed:
+            return self._instrumented_call('search', key)
+        index = self._find(key, hash(key))
+        if index < 0:
+            return None
+        return self._values[index]
+
     def delete(self, key):
-        """Delete a key"""
-        index = self.hash_function(key)
-        
-        while self.table[index] is not None:
-            if self.table[index][0] == key:
-                self.table[index] = None
-                return True
-            index = (index + 1) % self.size
-        
-        return False
+        """Delete a key, leaving a tombstone so probe chains stay intact"""
+        if self.stats is not None and self.stats.armed:
+            return self._instrumented_call('delete', key)
+        index = self._find(key, hash(key))
+        if index < 0:
+            return False
+
+        self._keys[index] = _TOMBSTONE
+        self._values[index] = None
+        self.count -= 1
+        self.tombstones += 1
+
+        if self.size > self.MIN_SIZE and self.count < self.size * self.MIN_LOAD:
+            self._resize(max(self.MIN_SIZE, self._round_up(self.count * 2)))
+        return True
+
+    def insert_many(self, pairs):
+        """Insert pairs after one up-front resize, skipping per-key load checks"""
+        pairs = _materialize(pairs)
+        self._reserve(self.count + len(pairs))
+        find = self._find
+        place = self._place
+        values = self._values
+        added = 0
+        for key, value in pairs:
+            h = hash(key)
+            index = find(key, h)
+            if index >= 0:
+                values[index] = value
+            else:
+                place(h, key, value)
+                added += 1
+        self.count += added
+
+    def search_many(self, keys):
+        find = self._find
+        values = self._values
+        out = []
+        for key in keys:
+            index = find(key, hash(key))
+            out.append(values[index] if index >= 0 else None)
+        return out
+
+    def _probe_length(self, key):
+        mask = self._mask
+        h = hash(key)
+        index = h & mask
+        dist = 0
+        while True:
+            k = self._keys[index]
+            if k is _EMPTY or ((index - self._hashes[index]) & mask) < dist:
+                return dist + 1
+            if k is not _TOMBSTONE and self._hashes[index] == h and k == key:
+                return dist + 1
+            index = (index + 1) & mask
+            dist += 1
+
+    def _layout_lengths(self):
+        mask = self._mask
+        for index, k in enumerate(self._keys):
+            if k is not _EMPTY and k is not _TOMBSTONE:
+                yield ((index - self._hashes[index]) & mask) + 1
+
+    def __len__(self):
+        return self.count
+
+    def items(self):
+        """Iterate over live (key, value) pairs"""
+        for k, v in zip(self._keys, self._values):
+            if k is not _EMPTY and k is not _TOMBSTONE:
+                yield k, v
 
 
 # ============================================================================
@@ -60,17 +444,23 @@ class SimpleHashTable:
 
 class Node:
     """Node for linked list in chaining"""
+    __slots__ = ('key', 'value', 'next')
+    
     def __init__(self, key, value):
         self.key = key
         self.value = value
         self.next = None
 
 
-class ChainingHashTable:
+class ChainingHashTable(BulkOperationsMixin, InstrumentationMixin):
     """Hash table using separate chaining with linked lists"""
     
+    # Subclasses and wrappers can thread extra links through their nodes
+    node_class = Node
+    
     def __init__(self, size=10):
         self.size = size
+        self.count = 0
         self.table = [None] * size
     
     def hash_function(self, key):
@@ -78,25 +468,44 @@ class ChainingHashTable:
         return hash(key) % self.size
     
     def insert(self, key, value):
-        """Insert using chaining"""
+        """Insert using chaining; returns the node now holding the key"""
+        if self.stats is not None and self.stats.armed:
+            return self._instrumented_call('insert', key, value)
         index = self.hash_function(key)
         
         if self.table[index] is None:
-            self.table[index] = Node(key, value)
+            node = self.table[index] = self.node_class(key, value)
+            self.count += 1
+            return node
         else:
             # Check if key exists and update, or add to chain
             current = self.table[index]
             while current:
                 if current.key == key:
                     current.value = value
-                    return
+                    return current
                 if current.next is None:
                     break
                 current = current.next
-            current.next = Node(key, value)
+            node = current.next = self.node_class(key, value)
+            self.count += 1
+            return node
+    
+    def find_node(self, key):
+        """Return the node holding key, or None"""
+        current = self.table[self.hash_function(key)]
+        
+        while current:
+            if current.key == key:
+                return current
+            current = current.next
+        
+        return None
     
     def search(self, key):
         """Search in chain"""
+        if self.stats is not None and self.stats.armed:
+            return self._instrumented_call('search', key)
         index = self.hash_function(key)
         current = self.table[index]
         
@@ -109,6 +518,8 @@ class ChainingHashTable:
     
     def delete(self, key):
         """Delete from chain"""
+        if self.stats is not None and self.stats.armed:
+            return self._instrumented_call('delete', key)
         index = self.hash_function(key)
         
         if self.table[index] is None:
@@ -116,48 +527,222 @@ class ChainingHashTable:
         
         if self.table[index].key == key:
             self.table[index] = self.table[index].next
+            self.count -= 1
             return True
         
         current = self.table[index]
         while current.next:
             if current.next.key == key:
                 current.next = current.next.next
+                self.count -= 1
                 return True
             current = current.next
         
         return False
+    
+    def _probe_length(self, key):
+        probes = 0
+        current = self.table[self.hash_function(key)]
+        while current:
+            probes += 1
+            if current.key == key:
+                break
+            current = current.next
+        return probes
+    
+    def _layout_lengths(self):
+        for head in self.table:
+            length = 0
+            while head:
+                length += 1
+                head = head.next
+            yield length
+    
+    def items(self):
+        """Iterate over (key, value) pairs chain by chain"""
+        for head in self.table:
+            current = head
+            while current:
+                yield current.key, current.value
+                current = current.next
 
 
 # ============================================================================
 # 3. DYNAMIC HASH TABLE - With Resizing
 # ============================================================================
 
-class DynamicHashTable:
-    """Hash table that resizes when load factor exceeds threshold"""
+class DynamicHashTable(BulkOperationsMixin, InstrumentationMixin):
+    """Hash table that resizes when load factor exceeds threshold
+
+    With incremental=True the table rehashes progressively, like Redis:
+    the old and new bucket arrays coexist and every operation migrates a
+    bounded number of old buckets, so no single insert pays for a full
+    rehash.
+    """
     
-    def __init__(self, initial_size=8):
+    def __init__(self, initial_size=8, incremental=False, rehash_step=1):
         self.size = initial_size
         self.count = 0
         self.load_factor_threshold = 0.7
-        self.table = [[] for _ in range(self.size)]
+        # Empty buckets share one immutable tuple and become lists on first
+        # insert, so allocating a bigger table is a single C-level fill
+        self.table = [()] * self.size
+        self.incremental = incremental
+        self.rehash_step = rehash_step
+        # Old bucket array still being drained during an incremental rehash
+        self._old_table = None
+        self._old_size = 0
+        self._rehash_pos = 0
     
     def hash_function(self, key):
         """Hash function"""
         return hash(key) % self.size
     
+    def is_rehashing(self):
+        return self._old_table is not None
+    
     def _resize(self):
         """Resize the table when load factor is exceeded"""
-        old_table = self.table
+        if self.incremental:
+            self._start_rehash()
+        else:
+            self._publish(self.size * 2)
+    
+    @_records_resize
+    def _start_rehash(self):
+        self._old_table = self.table
+        self._old_size = self.size
+        self._rehash_pos = 0
         self.size *= 2
-        self.table = [[] for _ in range(self.size)]
-        self.count = 0
+        self.table = [()] * self.size
+    
+    @_records_resize
+    def _publish(self, size):
+        """Rehash into a new bucket array and only then swap it in.
+
+        Readers that captured the old array keep a complete, unmodified
+        view, which is what snapshot_search() relies on.
+        """
+        table = [()] * size
+        # Keys are already unique, so entries move without duplicate checks
+        for bucket in self.table:
+            for entry in bucket:
+                index = hash(entry[0]) % size
+                if table[index]:
+                    table[index].append(entry)
+                else:
+                    table[index] = [entry]
+        self.table = table
+        self.size = size
+    
+    @classmethod
+    def _size_for(cls, n):
+        size = 8
+        while n / size > 0.7:
+            size *= 2
+        return size
+
+    def _reserve(self, n):
+        """Grow once, straight to a size that holds n entries"""
+        if self._old_table is not None:
+            self._rehash(self._old_size)
+        if n / self.size <= self.load_factor_threshold:
+            return
+        
+        size = self.size
+        while n / size > self.load_factor_threshold:
+            size *= 2
+        self._publish(size)
+
+    def insert_many(self, pairs):
+        """Insert pairs after one up-front resize, skipping per-key load checks"""
+        pairs = _materialize(pairs)
+        self._reserve(self.count + len(pairs))
+        size = self.size
+        table = self.table
         
-        for bucket in old_table:
-            for key, value in bucket:
-                self.insert(key, value)
+        if not self.count:
+            # Empty table: dedupe in C, then every key lands without a scan
+            pairs = dict(pairs).items()
+            for entry in pairs:
+                index = hash(entry[0]) % size
+                if table[index]:
+                    table[index].append(entry)
+                else:
+                    table[index] = [entry]
+            self.count = len(pairs)
+            return
+        
+        for key, value in pairs:
+            index = hash(key) % size
+            bucket = table[index]
+            for i, (k, v) in enumerate(bucket):
+                if k == key:
+                    bucket[i] = (key, value)
+                    break
+            else:
+                if bucket:
+                    bucket.append((key, value))
+                else:
+                    table[index] = [(key, value)]
+                self.count += 1
+        
+        if self.count / self.size > self.load_factor_threshold:
+            self._resize()
+
+    def _rehash(self, steps):
+        """Move up to `steps` non-empty old buckets into the new table"""
+        old_table = self._old_table
+        size = self.size
+        table = self.table
+        # Bound the work spent skipping empty buckets as well
+        empty_visits = steps * 10
+        
+        while steps and self._rehash_pos < self._old_size:
+            bucket = old_table[self._rehash_pos]
+            if not bucket:
+                self._rehash_pos += 1
+                empty_visits -= 1
+                if not empty_visits:
+                    break
+                continue
+            for entry in bucket:
+                index = hash(entry[0]) % size
+                if table[index]:
+                    table[index].append(entry)
+                else:
+                    table[index] = [entry]
+            old_table[self._rehash_pos] = ()
+            self._rehash_pos += 1
+            steps -= 1
+        
+        if self._rehash_pos >= self._old_size:
+            self._old_table = None
+            self._old_size = 0
+            self._rehash_pos = 0
+    
+    def _old_bucket(self, key):
+        """Bucket in the old table that may still hold key, or None"""
+        if self._old_table is None:
+            return None
+        index = hash(key) % self._old_size
+        if index < self._rehash_pos:
+            return None
+        return self._old_table[index]
     
     def insert(self, key, value):
         """Insert with automatic resizing"""
+        if self.stats is not None and self.stats.armed:
+            return self._instrumented_call('insert', key, value)
+        if self._old_table is not None:
+            self._rehash(self.rehash_step)
+            old_bucket = self._old_bucket(key)
+            if old_bucket:
+                for i, (k, v) in enumerate(old_bucket):
+                    if k == key:
+                        old_bucket[i] = (key, value)
+                        return
+        
         index = self.hash_function(key)
         
         for i, (k, v) in enumerate(self.table[index]):
@@ -165,15 +750,28 @@ class DynamicHashTable:
                 self.table[index][i] = (key, value)
                 return
         
-        self.table[index].append((key, value))
+        if self.table[index]:
+            self.table[index].append((key, value))
+        else:
+            self.table[index] = [(key, value)]
         self.count += 1
         
-        # Check load factor
-        if self.count / self.size > self.load_factor_threshold:
+        # Check load factor (a new rehash never starts mid-migration)
+        if self._old_table is None and self.count / self.size > self.load_factor_threshold:
             self._resize()
     
     def search(self, key):
         """Search for key"""
+        if self.stats is not None and self.stats.armed:
+            return self._instrumented_call('search', key)
+        if self._old_table is not None:
+            self._rehash(self.rehash_step)
+            old_bucket = self._old_bucket(key)
+            if old_bucket:
+                for k, v in old_bucket:
+                    if k == key:
+                        return v
+        
         index = self.hash_function(key)
         
         for k, v in self.table[index]:
@@ -184,21 +782,234 @@ class DynamicHashTable:
     
     def delete(self, key):
         """Delete key"""
+        if self.stats is not None and self.stats.armed:
+            return self._instrumented_call('delete', key)
+        if self._old_table is not None:
+            self._rehash(self.rehash_step)
+            old_bucket = self._old_bucket(key)
+            if old_bucket:
+                for i, (k, v) in enumerate(old_bucket):
+                    if k == key:
+                        self._old_table[hash(key) % self._old_size] = old_bucket[:i] + old_bucket[i + 1:]
+                        self.count -= 1
+                        return True
+        
         index = self.hash_function(key)
+        bucket = self.table[index]
         
-        for i, (k, v) in enumerate(self.table[index]):
+        for i, (k, v) in enumerate(bucket):
             if k == key:
-                self.table[index].pop(i)
+                # Copy-on-write so a concurrent snapshot reader never sees
+                # entries shift underneath it
+                self.table[index] = bucket[:i] + bucket[i + 1:]
                 self.count -= 1
                 return True
         
         return False
+    
+    def snapshot_search(self, key, default=None):
+        """Read-only lookup that never migrates buckets.
+
+        Safe to call without a lock while another thread writes: the bucket
+        array is captured once and indexed by its own length.
+        """
+        table = self.table
+        old_table = self._old_table
+        h = hash(key)
+        # Migration copies entries into the new array before clearing the
+        # old bucket, so checking old first cannot miss a moving key
+        if old_table is not None:
+            for k, v in old_table[h % len(old_table)]:
+                if k == key:
+                    return v
+        for k, v in table[h % len(table)]:
+            if k == key:
+                return v
+        return default
+    
+    def _probe_length(self, key):
+        buckets = [self.table[hash(key) % self.size]]
+        old_bucket = self._old_bucket(key)
+        if old_bucket is not None:
+            buckets.insert(0, old_bucket)
+        probes = 0
+        for bucket in buckets:
+            for k, v in bucket:
+                probes += 1
+                if k == key:
+                    return probes
+        return probes
+    
+    def _layout_lengths(self):
+        for bucket in self.table:
+            yield len(bucket)
+        if self._old_table is not None:
+            for bucket in self._old_table[self._rehash_pos:]:
+                yield len(bucket)
+    
+    def items(self):
+        """Iterate over (key, value) pairs, including not-yet-migrated ones"""
+        if self._old_table is not None:
+            for bucket in self._old_table:
+                yield from bucket
+        for bucket in self.table:
+            yield from bucket
 
 
 # ============================================================================
 # 4. COMPLEX HASH TABLE - With Custom Objects and Advanced Features
 # ============================================================================
 
+# ---- Pluggable hashers: each maps (bytes, seed) to a 64-bit int ----
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+
+def _rotl64(x, r):
+    return ((x << r) | (x >> (64 - r))) & _MASK64
+
+
+def _key_bytes(key):
+    """Encode a key so that equal keys always give equal bytes"""
+    if isinstance(key, str):
+        return key.encode('utf-8', 'surrogatepass')
+    if isinstance(key, (bytes, bytearray)):
+        return bytes(key)
+    # Numbers and custom objects: hash() already agrees for equal keys
+    # (1 == 1.0 == True), so hash its value instead of the object
+    return hash(key).to_bytes(8, 'little', signed=True)
+
+
+_FNV_OFFSET = 0xCBF29CE484222325
+_FNV_PRIME = 0x100000001B3
+
+
+def fnv1a_hash(data, seed=0):
+    """FNV-1a over 8-byte little-endian words, with a final xor-shift.
+
+    Folding whole words keeps the pure-Python loop short; the xor-shift
+    mixes high bits back down, since the table indexes by the low bits.
+    """
+    h = (_FNV_OFFSET ^ seed) & _MASK64
+    n = len(data)
+    end = n - n % 8
+    from_bytes = int.from_bytes
+    for i in range(0, end, 8):
+        h = ((h ^ from_bytes(data[i:i + 8], 'little')) * _FNV_PRIME) & _MASK64
+    h = ((h ^ from_bytes(data[end:], 'little') ^ (n << 56)) * _FNV_PRIME) & _MASK64
+    return h ^ (h >> 32)
+
+
+_XXH_P1 = 0x9E3779B185EBCA87
+_XXH_P2 = 0xC2B2AE3D27D4EB4F
+_XXH_P3 = 0x165667B19E3779F9
+_XXH_P4 = 0x85EBCA77C2B2AE63
+_XXH_P5 = 0x27D4EB2F165667C5
+
+
+def _xxh_round(acc, lane):
+    acc = (acc + lane * _XXH_P2) & _MASK64
+    return (_rotl64(acc, 31) * _XXH_P1) & _MASK64
+
+
+def xxhash64(data, seed=0):
+    """XXH64, reading lanes with int.from_bytes"""
+    seed &= _MASK64
+    n = len(data)
+    from_bytes = int.from_bytes
+    i = 0
+
+    if n >= 32:
+        v1 = (seed + _XXH_P1 + _XXH_P2) & _MASK64
+        v2 = (seed + _XXH_P2) & _MASK64
+        v3 = seed
+        v4 = (seed - _XXH_P1) & _MASK64
+        limit = n - 32
+        while i <= limit:
+            v1 = _xxh_round(v1, from_bytes(data[i:i + 8], 'little'))
+            v2 = _xxh_round(v2, from_bytes(data[i + 8:i + 16], 'little'))
+            v3 = _xxh_round(v3, from_bytes(data[i + 16:i + 24], 'little'))
+            v4 = _xxh_round(v4, from_bytes(data[i + 24:i + 32], 'little'))
+            i += 32
+        h = (_rotl64(v1, 1) + _rotl64(v2, 7) + _rotl64(v3, 12) + _rotl64(v4, 18)) & _MASK64
+        for v in (v1, v2, v3, v4):
+            h = (((h ^ _xxh_round(0, v)) * _XXH_P1) + _XXH_P4) & _MASK64
+    else:
+        h = (seed + _XXH_P5) & _MASK64
+
+    h = (h + n) & _MASK64
+    while i + 8 <= n:
+        h ^= _xxh_round(0, from_bytes(data[i:i + 8], 'little'))
+        h = (_rotl64(h, 27) * _XXH_P1 + _XXH_P4) & _MASK64
+        i += 8
+    if i + 4 <= n:
+        h ^= (from_bytes(data[i:i + 4], 'little') * _XXH_P1) & _MASK64
+        h = (_rotl64(h, 23) * _XXH_P2 + _XXH_P3) & _MASK64
+        i += 4
+    while i < n:
+        h ^= (data[i] * _XXH_P5) & _MASK64
+        h = (_rotl64(h, 11) * _XXH_P1) & _MASK64
+        i += 1
+
+    h ^= h >> 33
+    h = (h * _XXH_P2) & _MASK64
+    h ^= h >> 29
+    h = (h * _XXH_P3) & _MASK64
+    return h ^ (h >> 32)
+
+
+def siphash24(data, seed=0):
+    """SipHash-2-4; the low and high 64 bits of seed form the 128-bit key"""
+    k0 = seed & _MASK64
+    k1 = (seed >> 64) & _MASK64
+    v0 = k0 ^ 0x736F6D6570736575
+    v1 = k1 ^ 0x646F72616E646F6D
+    v2 = k0 ^ 0x6C7967656E657261
+    v3 = k1 ^ 0x7465646279746573
+
+    def sip_round(v0, v1, v2, v3):
+        v0 = (v0 + v1) & _MASK64
+        v1 = _rotl64(v1, 13) ^ v0
+        v0 = _rotl64(v0, 32)
+        v2 = (v2 + v3) & _MASK64
+        v3 = _rotl64(v3, 16) ^ v2
+        v0 = (v0 + v3) & _MASK64
+        v3 = _rotl64(v3, 21) ^ v0
+        v2 = (v2 + v1) & _MASK64
+        v1 = _rotl64(v1, 17) ^ v2
+        v2 = _rotl64(v2, 32)
+        return v0, v1, v2, v3
+
+    n = len(data)
+    end = n - n % 8
+    words = [int.from_bytes(data[i:i + 8], 'little') for i in range(0, end, 8)]
+    words.append(int.from_bytes(data[end:], 'little') | ((n & 0xFF) << 56))
+    for m in words:
+        v3 ^= m
+        v0, v1, v2, v3 = sip_round(v0, v1, v2, v3)
+        v0, v1, v2, v3 = sip_round(v0, v1, v2, v3)
+        v0 ^= m
+
+    v2 ^= 0xFF
+    for _ in range(4):
+        v0, v1, v2, v3 = sip_round(v0, v1, v2, v3)
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+def ord_sum_hash(data, seed=0):
+    """The original AdvancedHashTable string hash, kept for comparison"""
+    return sum(data)
+
+
+# Byte-oriented hashers selectable by name; 'native' is handled separately
+HASHERS = {
+    'fnv1a': fnv1a_hash,
+    'xxhash': xxhash64,
+    'siphash': siphash24,
+    'ord_sum': ord_sum_hash,
+}
+
+
 class Student:
     """Example class for storing in hash table"""
     def __init__(self, id, name, gpa):
@@ -210,38 +1021,57 @@ class Student:
         return f"Student({self.id}, {self.name}, {self.gpa})"
 
 
-class AdvancedHashTable:
-    """Advanced hash table with statistics and custom key handling"""
+class AdvancedHashTable(BulkOperationsMixin, InstrumentationMixin):
+    """Advanced hash table with statistics and custom key handling
+
+    `hasher` is 'native' (the default), a name from HASHERS, or any
+    callable taking (bytes, seed). Each table draws its own random seed
+    unless one is given, so colliding key sets cannot be precomputed.
+    """
     
-    def __init__(self, size=16):
+    def __init__(self, size=16, hasher='native', seed=None):
         self.size = size
         self.table = [[] for _ in range(self.size)]
         self.count = 0
         self.collisions = 0
+        self.seed = random.getrandbits(128) if seed is None else seed
+        self.hasher = hasher
+        if hasher == 'native':
+            self._hash = self._native_hash
+        else:
+            func = HASHERS[hasher] if isinstance(hasher, str) else hasher
+            seed = self.seed
+            self._hash = lambda key: func(_key_bytes(key), seed)
+    
+    def _native_hash(self, key):
+        # Mixing the seed in through a tuple hash keeps C speed
+        return hash((self.seed, key))
     
     def hash_function(self, key):
         """Support both hashable and custom objects"""
-        if isinstance(key, str):
-            return sum(ord(c) for c in key) % self.size
-        return hash(key) % self.size
+        return self._hash(key) % self.size
     
     def insert(self, key, value):
         """Insert with collision tracking"""
+        if self.stats is not None and self.stats.armed:
+            return self._instrumented_call('insert', key, value)
         index = self.hash_function(key)
         
-        # Check if bucket already has items (collision)
+        for i, (k, v) in enumerate(self.table[index]):
+            if k == key:
+                self.table[index][i] = (key, value)
+                return
+        
+        # A new key landing in an occupied bucket is a collision; updates are not
         if self.table[index]:
             self.collisions += 1
-            for i, (k, v) in enumerate(self.table[index]):
-                if k == key:
-                    self.table[index][i] = (key, value)
-                    return
-        
         self.table[index].append((key, value))
         self.count += 1
     
     def search(self, key):
         """Search with validation"""
+        if self.stats is not None and self.stats.armed:
+            return self._instrumented_call('search', key)
         index = self.hash_function(key)
         
         for k, v in self.table[index]:
@@ -252,6 +1082,8 @@ class AdvancedHashTable:
     
     def delete(self, key):
         """Delete with validation"""
+        if self.stats is not None and self.stats.armed:
+            return self._instrumented_call('delete', key)
         index = self.hash_function(key)
         
         for i, (k, v) in enumerate(self.table[index]):
@@ -262,17 +1094,993 @@ class AdvancedHashTable:
         
         raise KeyError(f"Key '{key}' not found")
     
+    def search_many(self, keys):
+        """Search every key; missing keys give None, as in the other tables"""
+        search = self.search
+        out = []
+        for key in keys:
+            try:
+                out.append(search(key))
+            except KeyError:
+                out.append(None)
+        return out
+    
+    def delete_many(self, keys):
+        """Delete every key, returning True or False per key like the other tables"""
+        delete = self.delete
+        out = []
+        for key in keys:
+            try:
+                delete(key)
+                out.append(True)
+            except KeyError:
+                out.append(False)
+        return out
+    
+    def items(self):
+        """Iterate over (key, value) pairs bucket by bucket"""
+        for bucket in self.table:
+            yield from bucket
+    
+    def _probe_length(self, key):
+        probes = 0
+        for k, v in self.table[self.hash_function(key)]:
+            probes += 1
+            if k == key:
+                break
+        return probes
+    
+    def _layout_lengths(self):
+        for bucket in self.table:
+            yield len(bucket)
+    
     def get_stats(self):
         """Get hash table statistics"""
+        stats = super().get_stats()
+        used = self.size - stats['chain_histogram'].get(0, 0)
+        stats['collisions'] = self.collisions
+        # Mean length of the chains a successful lookup can actually walk
+        stats['avg_chain_length'] = self.count / used if used else 0.0
+        return stats
+
+
+# ============================================================================
+# 5. COMPACT HASH TABLE - Sparse Index + Dense Entry Arrays
+# ============================================================================
+
+_IX_EMPTY = -1
+_IX_DUMMY = -2
+
+
+def _index_typecode(size):
+    """Smallest signed array type that can address every dense entry"""
+    if size <= 0x80:
+        return 'b'
+    if size <= 0x8000:
+        return 'h'
+    if size <= 0x80000000:
+        return 'i'
+    return 'q'
+
+
+class CompactHashTable(BulkOperationsMixin, InstrumentationMixin):
+    """Hash table laid out like CPython's compact dict.
+
+    A sparse index array maps slots to positions in dense parallel arrays
+    of hashes, keys and values. Entries are never wrapped in tuples or
+    nodes, and iteration follows insertion order.
+    """
+
+    PERTURB_SHIFT = 5
+
+    def __init__(self, size=8):
+        self.count = 0
+        self._alloc(self._round_up(size))
+        self._hashes = array('q')
+        self._keys = []
+        self._values = []
+
+    @staticmethod
+    def _round_up(n):
+        size = 8
+        while size < n:
+            size *= 2
+        return size
+
+    def _alloc(self, size):
+        self.size = size
+        self._mask = size - 1
+        self._usable = size * 2 // 3
+        self._index = array(_index_typecode(size), [_IX_EMPTY]) * size
+
+    def hash_function(self, key):
+        """Home slot of a key"""
+        return hash(key) & self._mask
+
+    def _probe(self, h):
+        """Yield slots in CPython's perturbed probe order"""
+        mask = self._mask
+        perturb = h & 0xFFFFFFFFFFFFFFFF
+        i = h & mask
+        while True:
+            yield i
+            perturb >>= self.PERTURB_SHIFT
+            i = (i * 5 + perturb + 1) & mask
+
+    def _lookup(self, key, h):
+        """Return (slot, dense position); position is -1 when absent"""
+        index = self._index
+        for slot in self._probe(h):
+            ix = index[slot]
+            if ix == _IX_EMPTY:
+                return slot, -1
+            if ix >= 0 and self._hashes[ix] == h:
+                k = self._keys[ix]
+                if k is key or k == key:
+                    return slot, ix
+
+    def _free_slot(self, h):
+        for slot in self._probe(h):
+            if self._index[slot] == _IX_EMPTY:
+                return slot
+
+    @classmethod
+    def _size_for(cls, n):
+        return cls._round_up(n * 3 // 2 + 1)
+
+    def _reserve(self, n):
+        if n > self._usable:
+            self._resize(n)
+
+    @_records_resize
+    def _resize(self, min_entries=0):
+        """Compact the dense arrays and rebuild the index for the live entries"""
+        if len(self._keys) != self.count:
+            live = [i for i, k in enumerate(self._keys) if k is not _TOMBSTONE]
+            self._hashes = array('q', (self._hashes[i] for i in live))
+            self._keys = [self._keys[i] for i in live]
+            self._values = [self._values[i] for i in live]
+        self._alloc(self._round_up(max(self.count * 3, min_entries * 3 // 2 + 1)))
+        for ix, h in enumerate(self._hashes):
+            self._index[self._free_slot(h)] = ix
+
+    def insert(self, key, value):
+        """Insert key-value pair"""
+        if self.stats is not None and self.stats.armed:
+            return self._instrumented_call('insert', key, value)
+        h = hash(key)
+        slot, ix = self._lookup(key, h)
+        if ix >= 0:
+            self._values[ix] = value
+            return
+
+        if len(self._keys) >= self._usable:
+            self._resize()
+            slot = self._free_slot(h)
+
+        self._index[slot] = len(self._keys)
+        self._hashes.append(h)
+        self._keys.append(key)
+        self._values.append(value)
+        self.count += 1
+
+    def search(self, key):
+        """Search for a key"""
+        if self.stats is not None and self.stats.armed:
+            return self._instrumented_call('search', key)
+        _, ix = self._lookup(key, hash(key))
+        if ix < 0:
+            return None
+        return self._values[ix]
+
+    def delete(self, key):
+        """Delete a key; its dense entry is reclaimed at the next resize"""
+        if self.stats is not None and self.stats.armed:
+            return self._instrumented_call('delete', key)
+        slot, ix = self._lookup(key, hash(key))
+        if ix < 0:
+            return False
+        self._index[slot] = _IX_DUMMY
+        self._keys[ix] = _TOMBSTONE
+        self._values[ix] = None
+        self.count -= 1
+        return True
+
+    def _probe_length(self, key):
+        h = hash(key)
+        for probes, slot in enumerate(self._probe(h), 1):
+            ix = self._index[slot]
+            if ix == _IX_EMPTY or (ix >= 0 and self._hashes[ix] == h and self._keys[ix] == key):
+                return probes
+
+    def _layout_lengths(self):
+        for ix, h in enumerate(self._hashes):
+            if self._keys[ix] is _TOMBSTONE:
+                continue
+            for probes, slot in enumerate(self._probe(h), 1):
+                if self._index[slot] == ix:
+                    yield probes
+                    break
+
+    def __len__(self):
+        return self.count
+
+    def items(self):
+        """Iterate over (key, value) pairs in insertion order"""
+        for k, v in zip(self._keys, self._values):
+            if k is not _TOMBSTONE:
+                yield k, v
+
+
+def _sample_key_sets(n, rng):
+    """Key sets shaped like real workloads, including anagram-heavy words"""
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    base_words = [''.join(rng.choice(letters) for _ in range(8)) for _ in range(max(1, n // 20))]
+    anagrams = []
+    while len(anagrams) < n:
+        chars = list(rng.choice(base_words))
+        rng.shuffle(chars)
+        anagrams.append(''.join(chars))
+    return {
+        'sequential_int': list(range(n)),
+        'anagram_words': anagrams,
+        'urls': [f"https://example.com/user/{rng.getrandbits(32)}/post/{i}" for i in range(n)],
+        'uuid_bytes': [rng.getrandbits(128).to_bytes(16, 'little') for _ in range(n)],
+    }
+
+
+def benchmark_hashers(n=20_000, size=4096, hashers=None, seed=0):
+    """Report hashing throughput and bucket spread for each hasher.
+
+    For every key set this returns keys/sec plus the longest bucket, the
+    share of empty buckets, and the largest bucket divided by the mean.
+    """
+    rng = random.Random(seed)
+    if hashers is None:
+        hashers = ['native'] + list(HASHERS)
+    key_sets = _sample_key_sets(n, rng)
+
+    results = {}
+    for hasher in hashers:
+        table = AdvancedHashTable(size, hasher=hasher, seed=rng.getrandbits(128))
+        index_of = table.hash_function
+        results[hasher] = {}
+        for name, keys in key_sets.items():
+            start = time.perf_counter()
+            indexes = [index_of(k) for k in keys]
+            elapsed = time.perf_counter() - start
+            buckets = [0] * size
+            for i in indexes:
+                buckets[i] += 1
+            results[hasher][name] = {
+                'keys_per_sec': len(keys) / elapsed if elapsed else float('inf'),
+                'max_bucket': max(buckets),
+                'empty_ratio': buckets.count(0) / size,
+                'max_over_mean': max(buckets) / (len(keys) / size),
+            }
+    return results
+
+
+def memory_report(n=1_000_000, layouts=None):
+    """Measure bytes per entry of each table layout holding n int keys.
+
+    Keys and values are allocated before measuring so only the table's own
+    storage is counted. Pass n=10_000_000 to reproduce the large workload.
+    """
+    if layouts is None:
+        layouts = {
+            'dict': dict,
+            'SimpleHashTable': SimpleHashTable,
+            'ChainingHashTable': lambda: ChainingHashTable(n),
+            'DynamicHashTable': DynamicHashTable,
+            'AdvancedHashTable': lambda: AdvancedHashTable(n),
+            'CompactHashTable': CompactHashTable,
+        }
+
+    keys = list(range(n))
+    report = {}
+    for name, factory in layouts.items():
+        tracemalloc.start()
+        table = factory()
+        store = table.__setitem__ if isinstance(table, dict) else table.insert
+        for k in keys:
+            store(k, k)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        report[name] = {
+            'bytes': current,
+            'peak_bytes': peak,
+            'bytes_per_entry': current / n if n else 0.0,
+        }
+        del table
+    return report
+
+
+# ============================================================================
+# 6. SHARDED HASH TABLE - Concurrent Access over DynamicHashTable Shards
+# ============================================================================
+
+_MISSING = object()
+
+# Fibonacci hashing constant; spreads shard choice across the high bits
+_FIB64 = 0x9E3779B97F4A7C15
+
+
+class ShardedHashTable:
+    """Thread-safe hash map that partitions keys over DynamicHashTable shards.
+
+    Writers take only their shard's lock. Reads take no lock at all and use
+    DynamicHashTable.snapshot_search(), so a shard that is resizing keeps
+    serving lookups from its previous bucket array.
+    """
+    
+    def __init__(self, shards=16, initial_size=8):
+        self.num_shards = shards
+        self.shards = [DynamicHashTable(initial_size) for _ in range(shards)]
+        self.locks = [threading.Lock() for _ in range(shards)]
+    
+    def _shard_index(self, key):
+        # Shards pick from the high bits and buckets use the low bits,
+        # otherwise every key in a shard would share bucket residues
+        return (((hash(key) * _FIB64) & _MASK64) >> 32) % self.num_shards
+    
+    def insert(self, key, value):
+        i = self._shard_index(key)
+        with self.locks[i]:
+            self.shards[i].insert(key, value)
+    
+    def search(self, key):
+        return self.shards[self._shard_index(key)].snapshot_search(key)
+    
+    def delete(self, key):
+        i = self._shard_index(key)
+        with self.locks[i]:
+            return self.shards[i].delete(key)
+    
+    def get_or_insert(self, key, value):
+        """Return the stored value, inserting `value` first if key is absent"""
+        i = self._shard_index(key)
+        shard = self.shards[i]
+        current = shard.snapshot_search(key, _MISSING)
+        if current is not _MISSING:
+            return current
+        with self.locks[i]:
+            current = shard.snapshot_search(key, _MISSING)
+            if current is _MISSING:
+                shard.insert(key, value)
+                current = value
+        return current
+    
+    def compute(self, key, func):
+        """Atomically replace the value with func(key, old_value_or_None).
+
+        Returning None from func removes the key.
+        """
+        i = self._shard_index(key)
+        shard = self.shards[i]
+        with self.locks[i]:
+            new = func(key, shard.snapshot_search(key))
+            if new is None:
+                shard.delete(key)
+            else:
+                shard.insert(key, new)
+        return new
+    
+    @property
+    def count(self):
+        return sum(shard.count for shard in self.shards)
+    
+    def __len__(self):
+        return self.count
+    
+    def items(self):
+        """Iterate over each shard's bucket array as of when it is reached"""
+        for shard in self.shards:
+            for bucket in shard.table:
+                yield from bucket
+    
+    def save(self, path, allow_pickle=False):
+        """Write the table to disk in the MappedHashTable file format"""
+        MappedHashTable.save(self, path, allow_pickle=allow_pickle)
+
+
+# ============================================================================
+# 7. MAPPED HASH TABLE - Persistent Open Addressing over mmap
+# ============================================================================
+
+# File layout:
+#   header  magic, capacity, live count, used slots (live + deleted), heap bytes
+#   slots   capacity fixed-width records at _SLOTS_OFFSET
+#   heap    length-prefixed str/bytes keys and non-inline values
+_MAGIC = b'PYDSAHT1'
+_HEADER = struct.Struct('<8sQQQQ')
+_SLOT = struct.Struct('<QBBxxxxxxqq')       # hash, key kind, value kind, key, value
+_HEAP_LEN = struct.Struct('<I')
+_FLOAT = struct.Struct('<d')
+_SLOTS_OFFSET = 64
+
+# Key kinds: int keys live in the slot, str/bytes keys are heap offsets
+_K_EMPTY, _K_INT, _K_STR, _K_BYTES, _K_DELETED = 0, 1, 2, 3, 0xFF
+# Value kinds: int/float/None live in the slot, the rest go to the heap
+_V_INT, _V_FLOAT, _V_NONE, _V_STR, _V_BYTES, _V_PICKLE = 1, 2, 3, 4, 5, 6
+
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+def _encode_key(key):
+    """Return (kind, payload) where payload is an int or the key's bytes"""
+    if isinstance(key, int) and _INT64_MIN <= key <= _INT64_MAX:
+        return _K_INT, int(key)
+    if isinstance(key, str):
+        return _K_STR, key.encode('utf-8', 'surrogatepass')
+    if isinstance(key, (bytes, bytearray)):
+        return _K_BYTES, bytes(key)
+    raise TypeError(f"MappedHashTable keys must be int64, str or bytes, not {type(key).__name__}")
+
+
+def _stable_hash(kind, payload):
+    """Hash that is identical in every process (unlike hash() on str)"""
+    if kind == _K_INT:
+        h = (payload * _FIB64) & _MASK64
+        return h ^ (h >> 29)
+    return fnv1a_hash(payload, kind)
+
+
+class MappedHashTable:
+    """Read-only or read-write hash table backed directly by an mmap'ed file.
+
+    Opening a file parses only the header; each lookup unpacks just the
+    slots on its probe path, so the OS pages in only what is touched.
+
+    Values are None, int64, float, str or bytes. Other values are pickled
+    only with allow_pickle=True, and a file holding pickled values can be
+    read only when opened with allow_pickle=True. Unpickling runs code chosen
+    by whoever wrote the file, so only do that for files you trust.
+    """
+
+    MAX_LOAD = 0.7
+
+    def __init__(self, path, mode='r', allow_pickle=False):
+        if mode not in ('r', 'r+'):
+            raise ValueError("mode must be 'r' or 'r+'")
+        self.path = path
+        self.mode = mode
+        self.allow_pickle = allow_pickle
+        self._file = open(path, 'rb' if mode == 'r' else 'r+b')
+        self._map()
+        magic, self.size, self.count, self._used, self._heap_size = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a MappedHashTable file")
+        self._mask = self.size - 1
+        self._heap_offset = _SLOTS_OFFSET + self.size * _SLOT.size
+
+    def _map(self):
+        access = mmap.ACCESS_READ if self.mode == 'r' else mmap.ACCESS_WRITE
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=access)
+
+    @classmethod
+    def open(cls, path, mode='r', allow_pickle=False):
+        """Open a file; allow_pickle=True unpickles values, so trusted files only"""
+        return cls(path, mode, allow_pickle)
+
+    # ---- writing files ----
+
+    @staticmethod
+    def _encode_value(value, heap, allow_pickle=False):
+        """Return (kind, slot field), appending heap data when needed"""
+        if value is None:
+            return _V_NONE, 0
+        if isinstance(value, int) and not isinstance(value, bool) and _INT64_MIN <= value <= _INT64_MAX:
+            return _V_INT, value
+        if isinstance(value, float):
+            return _V_FLOAT, int.from_bytes(_FLOAT.pack(value), 'little', signed=True)
+        if isinstance(value, str):
+            kind, data = _V_STR, value.encode('utf-8', 'surrogatepass')
+        elif isinstance(value, (bytes, bytearray)):
+            kind, data = _V_BYTES, bytes(value)
+        elif allow_pickle:
+            kind, data = _V_PICKLE, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        else:
+            raise TypeError(f"MappedHashTable values must be None, int64, float, str or bytes, "
+                            f"not {type(value).__name__} (allow_pickle=True stores other values)")
+        offset = len(heap)
+        heap += _HEAP_LEN.pack(len(data))
+        heap += data
+        return kind, offset
+
+    @classmethod
+    def save(cls, table, path, capacity=None, allow_pickle=False):
+        """Write any table (or dict) with an items() method to path"""
+        entries = [(_encode_key(k), v) for k, v in table.items()]
+        needed = int(len(entries) / cls.MAX_LOAD) + 1
+        size = 8
+        while size < max(needed, capacity or 0):
+            size *= 2
+        mask = size - 1
+
+        slots = bytearray(size * _SLOT.size)
+        heap = bytearray()
+        for (kind, payload), value in entries:
+            h = _stable_hash(kind, payload)
+            index = h & mask
+            while slots[index * _SLOT.size + 8] != _K_EMPTY:
+                index = (index + 1) & mask
+            if kind == _K_INT:
+                key_field = payload
+            else:
+                key_field = len(heap)
+                heap += _HEAP_LEN.pack(len(payload))
+                heap += payload
+            value_kind, value_field = cls._encode_value(value, heap, allow_pickle)
+            _SLOT.pack_into(slots, index * _SLOT.size, h, kind, value_kind, key_field, value_field)
+
+        # Write beside the target and rename, so readers never see half a file
+        tmp = f"{path}.tmp"
+        with open(tmp, 'wb') as f:
+            header = _HEADER.pack(_MAGIC, size, len(entries), len(entries), len(heap))
+            f.write(header.ljust(_SLOTS_OFFSET, b'\0'))
+            f.write(slots)
+            f.write(heap)
+        os.replace(tmp, path)
+
+    # ---- reading ----
+
+    def _heap_bytes(self, offset):
+        start = self._heap_offset + offset
+        (n,) = _HEAP_LEN.unpack_from(self._mm, start)
+        return self._mm[start + 4:start + 4 + n]
+
+    def _decode_value(self, kind, field):
+        if kind == _V_INT:
+            return field
+        if kind == _V_NONE:
+            return None
+        if kind == _V_FLOAT:
+            return _FLOAT.unpack(field.to_bytes(8, 'little', signed=True))[0]
+        data = self._heap_bytes(field)
+        if kind == _V_STR:
+            return data.decode('utf-8', 'surrogatepass')
+        if kind == _V_BYTES:
+            return data
+        if kind != _V_PICKLE:
+            raise ValueError(f"{self.path} has an unknown value kind {kind}")
+        if not self.allow_pickle:
+            raise ValueError(f"{self.path} holds pickled values; open it with allow_pickle=True "
+                             "only if the file is trusted")
+        return pickle.loads(data)
+
+    def _decode_key(self, kind, field):
+        if kind == _K_INT:
+            return field
+        data = self._heap_bytes(field)
+        return data.decode('utf-8', 'surrogatepass') if kind == _K_STR else data
+
+    def _find(self, kind, payload, h):
+        """Return (slot, first reusable slot); slot is -1 when absent"""
+        mm = self._mm
+        mask = self._mask
+        unpack_from = _SLOT.unpack_from
+        index = h & mask
+        reusable = -1
+        while True:
+            offset = _SLOTS_OFFSET + index * _SLOT.size
+            slot_hash, slot_kind, _, key_field, _ = unpack_from(mm, offset)
+            if slot_kind == _K_EMPTY:
+                return -1, (index if reusable < 0 else reusable)
+            if slot_kind == _K_DELETED:
+                if reusable < 0:
+                    reusable = index
+            elif slot_hash == h and slot_kind == kind:
+                if kind == _K_INT:
+                    if key_field == payload:
+                        return index, reusable
+                elif self._heap_bytes(key_field) == payload:
+                    return index, reusable
+            index = (index + 1) & mask
+
+    def search(self, key):
+        """Search for a key"""
+        try:
+            kind, payload = _encode_key(key)
+        except TypeError:
+            return None
+        index, _ = self._find(kind, payload, _stable_hash(kind, payload))
+        if index < 0:
+            return None
+        _, _, value_kind, _, value_field = _SLOT.unpack_from(self._mm, _SLOTS_OFFSET + index * _SLOT.size)
+        return self._decode_value(value_kind, value_field)
+
+    def __len__(self):
+        return self.count
+
+    def items(self):
+        """Iterate over (key, value) pairs in slot order"""
+        for index in range(self.size):
+            h, kind, value_kind, key_field, value_field = _SLOT.unpack_from(
+                self._mm, _SLOTS_OFFSET + index * _SLOT.size)
+            if kind != _K_EMPTY and kind != _K_DELETED:
+                yield self._decode_key(kind, key_field), self._decode_value(value_kind, value_field)
+
+    # ---- writing in place ('r+' mode) ----
+
+    def _check_writable(self):
+        if self.mode != 'r+':
+            raise PermissionError("MappedHashTable was opened read-only")
+
+    def _append_heap(self, data):
+        """Append heap bytes, growing the file geometrically when full"""
+        end = self._heap_offset + self._heap_size
+        needed = end + len(data)
+        if needed > len(self._mm):
+            new_length = max(needed, len(self._mm) * 2)
+            self._mm.close()
+            self._file.truncate(new_length)
+            self._map()
+        self._mm[end:needed] = data
+        offset = self._heap_size
+        self._heap_size += len(data)
+        return offset
+
+    def _write_header(self):
+        _HEADER.pack_into(self._mm, 0, _MAGIC, self.size, self.count, self._used, self._heap_size)
+
+    def insert(self, key, value):
+        """Insert or update a key in place; grows by rewriting when too full"""
+        self._check_writable()
+        kind, payload = _encode_key(key)
+        h = _stable_hash(kind, payload)
+        index, reusable = self._find(kind, payload, h)
+
+        heap = bytearray()
+        value_kind, value_field = self._encode_value(value, heap, self.allow_pickle)
+        if heap:
+            value_field = self._append_heap(bytes(heap)) + value_field
+
+        if index >= 0:
+            offset = _SLOTS_OFFSET + index * _SLOT.size
+            _, _, _, key_field, _ = _SLOT.unpack_from(self._mm, offset)
+            _SLOT.pack_into(self._mm, offset, h, kind, value_kind, key_field, value_field)
+            return
+
+        if (self._used + 1) > self.size * self.MAX_LOAD:
+            self._grow()
+            self.insert(key, value)
+            return
+
+        offset = _SLOTS_OFFSET + reusable * _SLOT.size
+        reused = self._mm[offset + 8] == _K_DELETED
+        if kind == _K_INT:
+            key_field = payload
+        else:
+            key_field = self._append_heap(_HEAP_LEN.pack(len(payload)) + payload)
+        _SLOT.pack_into(self._mm, offset, h, kind, value_kind, key_field, value_field)
+        self.count += 1
+        if not reused:
+            self._used += 1
+        self._write_header()
+
+    def delete(self, key):
+        """Delete a key, leaving a deleted marker in its slot"""
+        self._check_writable()
+        kind, payload = _encode_key(key)
+        index, _ = self._find(kind, payload, _stable_hash(kind, payload))
+        if index < 0:
+            return False
+        self._mm[_SLOTS_OFFSET + index * _SLOT.size + 8] = _K_DELETED
+        self.count -= 1
+        self._write_header()
+        return True
+
+    def _grow(self):
+        """Rewrite the file at double capacity, dropping garbage, and remap"""
+        items = list(self.items())
+        self.close()
+        MappedHashTable.save(dict(items), self.path, capacity=self.size * 2, allow_pickle=self.allow_pickle)
+        self.__init__(self.path, self.mode, self.allow_pickle)
+
+    def flush(self):
+        if self.mode == 'r+':
+            self._mm.flush()
+
+    def close(self):
+        if not self._mm.closed:
+            self.flush()
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ============================================================================
+# 8. CACHES - LRU / LFU / TTL Built on ChainingHashTable Nodes
+# ============================================================================
+
+class CacheNode(Node):
+    """Chain node that also sits on a cache's doubly linked usage list"""
+    __slots__ = ('prev_used', 'next_used', 'freq', 'expires_at')
+    
+    def __init__(self, key, value):
+        super().__init__(key, value)
+        self.prev_used = None
+        self.next_used = None
+        self.freq = 1
+        self.expires_at = None
+
+
+class _CacheTable(ChainingHashTable):
+    node_class = CacheNode
+
+
+def _new_list():
+    """Circular usage list with a sentinel head"""
+    head = CacheNode(None, None)
+    head.prev_used = head.next_used = head
+    return head
+
+
+def _push_front(head, node):
+    node.prev_used = head
+    node.next_used = head.next_used
+    head.next_used.prev_used = node
+    head.next_used = node
+
+
+def _unlink(node):
+    node.prev_used.next_used = node.next_used
+    node.next_used.prev_used = node.prev_used
+    node.prev_used = node.next_used = None
+
+
+class LRUCache:
+    """Bounded cache evicting the least recently used key in O(1).
+
+    The hash chains and the recency list share one CacheNode per key. With
+    `ttl` set, entries expire lazily on access and in periodic sweeps run
+    from put() at most every `sweep_interval` seconds.
+    """
+    
+    def __init__(self, capacity=128, ttl=None, sweep_interval=None, clock=time.monotonic):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.ttl = ttl
+        self.sweep_interval = ttl if sweep_interval is None else sweep_interval
+        self.clock = clock
+        self._table = _CacheTable(capacity)
+        self._usage = _new_list()
+        self._last_sweep = clock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    # ---- policy hooks ----
+    
+    def _on_insert(self, node):
+        _push_front(self._usage, node)
+    
+    def _on_access(self, node):
+        _unlink(node)
+        _push_front(self._usage, node)
+    
+    def _on_update(self, node):
+        self._on_access(node)
+    
+    def _on_remove(self, node):
+        _unlink(node)
+    
+    def _victim(self):
+        return self._usage.prev_used
+    
+    # ---- core operations ----
+    
+    def _expired(self, node, now):
+        return node.expires_at is not None and node.expires_at <= now
+    
+    def _remove(self, node):
+        self._on_remove(node)
+        self._table.delete(node.key)
+    
+    def get(self, key, default=None):
+        node = self._table.find_node(key)
+        if node is None:
+            self.misses += 1
+            return default
+        if self._expired(node, self.clock()):
+            self._remove(node)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._on_access(node)
+        return node.value
+    
+    def put(self, key, value, ttl=None):
+        now = self.clock()
+        if self.sweep_interval is not None and now - self._last_sweep >= self.sweep_interval:
+            self.sweep()
+        
+        ttl = self.ttl if ttl is None else ttl
+        node = self._table.find_node(key)
+        if node is not None:
+            node.value = value
+            node.expires_at = None if ttl is None else now + ttl
+            self._on_update(node)
+            return
+        
+        if self._table.count >= self.capacity:
+            self._remove(self._victim())
+            self.evictions += 1
+        node = self._table.insert(key, value)
+        node.expires_at = None if ttl is None else now + ttl
+        self._on_insert(node)
+    
+    def delete(self, key):
+        node = self._table.find_node(key)
+        if node is None:
+            return False
+        self._remove(node)
+        return True
+    
+    def sweep(self):
+        """Drop every expired entry; returns how many were removed"""
+        now = self.clock()
+        self._last_sweep = now
+        expired = [node for node in self._nodes() if self._expired(node, now)]
+        for node in expired:
+            self._remove(node)
+        self.expirations += len(expired)
+        return len(expired)
+    
+    def _nodes(self):
+        for head in self._table.table:
+            node = head
+            while node:
+                yield node
+                node = node.next
+    
+    def __contains__(self, key):
+        node = self._table.find_node(key)
+        return node is not None and not self._expired(node, self.clock())
+    
+    def __len__(self):
+        return self._table.count
+    
+    def stats(self):
+        lookups = self.hits + self.misses
         return {
-            'size': self.size,
-            'entries': self.count,
-            'collisions': self.collisions,
-            'load_factor': self.count / self.size,
-            'avg_chain_length': self.count / self.size
+            'size': len(self),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
         }
 
 
+class LFUCache(LRUCache):
+    """Bounded cache evicting the least frequently used key in O(1).
+
+    Nodes sit in one usage list per access count; ties within the lowest
+    count are broken by recency.
+    """
+    
+    def __init__(self, capacity=128, ttl=None, sweep_interval=None, clock=time.monotonic):
+        super().__init__(capacity, ttl, sweep_interval, clock)
+        self._buckets = {}
+        self._min_freq = 1
+    
+    def _bucket(self, freq):
+        head = self._buckets.get(freq)
+        if head is None:
+            head = self._buckets[freq] = _new_list()
+        return head
+    
+    def _drop_if_empty(self, freq):
+        head = self._buckets[freq]
+        if head.next_used is head:
+            del self._buckets[freq]
+            return True
+        return False
+    
+    def _on_insert(self, node):
+        node.freq = 1
+        _push_front(self._bucket(1), node)
+        self._min_freq = 1
+    
+    def _on_access(self, node):
+        freq = node.freq
+        _unlink(node)
+        if self._drop_if_empty(freq) and self._min_freq == freq:
+            self._min_freq = freq + 1
+        node.freq = freq + 1
+        _push_front(self._bucket(node.freq), node)
+    
+    def _on_remove(self, node):
+        _unlink(node)
+        self._drop_if_empty(node.freq)
+    
+    def _victim(self):
+        if self._min_freq not in self._buckets:
+            # Deletes and expiries can empty the lowest bucket
+            self._min_freq = min(self._buckets)
+        return self._buckets[self._min_freq].prev_used
+
+
+class TTLCache(LRUCache):
+    """Bounded cache where every entry expires `ttl` seconds after its put.
+
+    The usage list is kept in expiry order, so sweeps stop at the first
+    live entry and eviction removes the entry closest to expiring.
+    """
+    
+    def __init__(self, capacity=128, ttl=60.0, sweep_interval=None, clock=time.monotonic):
+        super().__init__(capacity, ttl, sweep_interval, clock)
+    
+    def _on_access(self, node):
+        # Reads do not extend a lifetime
+        pass
+    
+    def _on_update(self, node):
+        _unlink(node)
+        _push_front(self._usage, node)
+    
+    def sweep(self):
+        now = self.clock()
+        self._last_sweep = now
+        removed = 0
+        node = self._usage.prev_used
+        while node is not self._usage and self._expired(node, now):
+            older = node.prev_used
+            self._remove(node)
+            removed += 1
+            node = older
+        self.expirations += removed
+        return removed
+    
+    def put(self, key, value, ttl=None):
+        if ttl is not None and ttl != self.ttl:
+            # A per-key lifetime would break the expiry ordering
+            raise ValueError("TTLCache uses one ttl for every entry")
+        super().put(key, value)
+
+
+def cached(cache=None, key=None):
+    """Memoize a function through a cache (an LRUCache by default).
+
+    Usable bare (@cached) or configured (@cached(LFUCache(1024))). The
+    wrapper exposes the cache as `.cache` for stats and invalidation.
+    """
+    if callable(cache) and not isinstance(cache, LRUCache):
+        return cached()(cache)
+    if cache is None:
+        cache = LRUCache()
+    
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if key is not None:
+                cache_key = key(*args, **kwargs)
+            elif kwargs:
+                cache_key = (args, tuple(sorted(kwargs.items())))
+            else:
+                cache_key = args
+            value = cache.get(cache_key, _MISSING)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                cache.put(cache_key, value)
+            return value
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
 # ============================================================================
 # USAGE EXAMPLES
 # ============================================================================
@@ -311,6 +2119,13 @@ if __name__ == "__main__":
     print(f"Final table size: {dyn_ht.size}")
     print(f"Search 'key5': {dyn_ht.search('key5')}")
     print(f"Search 'key9': {dyn_ht.search('key9')}")
+    inc_ht = DynamicHashTable(initial_size=4, incremental=True)
+    for i in range(10):
+        inc_ht.insert(f"key{i}", f"value{i}")
+    print(f"Incremental size: {inc_ht.size}, still rehashing: {inc_ht.is_rehashing()}")
+    print(f"Incremental search 'key3': {inc_ht.search('key3')}")
+    bulk_ht = DynamicHashTable.from_pairs((f"key{i}", i) for i in range(1000))
+    print(f"from_pairs size: {bulk_ht.size}, search_many: {bulk_ht.search_many(['key1', 'key999', 'nope'])}")
     
     print("\n" + "=" * 70)
     print("4. ADVANCED HASH TABLE WITH CUSTOM OBJECTS")
@@ -330,3 +2145,60 @@ if __name__ == "__main__":
     print(f"Search ID 102: {adv_ht.search(102)}")
     print(f"Delete ID 102: {adv_ht.delete(102)}")
     print(f"Table Stats: {adv_ht.get_stats()}")
+    dyn_ht.enable_stats()
+    for i in range(100):
+        dyn_ht.insert(f"key{i}", i)
+        dyn_ht.search(f"key{i // 2}")
+    dyn_stats = dyn_ht.get_stats()
+    print(f"Dynamic stats: max_chain={dyn_stats['max_chain']}, resizes={dyn_stats['resizes']}, "
+          f"probe histogram={dyn_stats['probe_histogram']}")
+    for name, by_keys in benchmark_hashers(n=2000, size=256).items():
+        words = by_keys['anagram_words']
+        print(f"{name:>8}: {words['keys_per_sec']:>10.0f} keys/s, anagram max bucket {words['max_bucket']}")
+    
+    print("\n" + "=" * 70)
+    print("5. COMPACT HASH TABLE (Insertion-ordered)")
+    print("=" * 70)
+    compact_ht = CompactHashTable()
+    for word in ["pear", "fig", "kiwi", "plum"]:
+        compact_ht.insert(word, len(word))
+    compact_ht.delete("fig")
+    print(f"Items in insertion order: {list(compact_ht.items())}")
+    for name, row in memory_report(20_000).items():
+        print(f"{name:>18}: {row['bytes_per_entry']:.1f} bytes/entry")
+    
+    print("\n" + "=" * 70)
+    print("6. SHARDED HASH TABLE (Thread-safe)")
+    print("=" * 70)
+    sharded_ht = ShardedHashTable(shards=8)
+    words = ["red", "green", "blue", "red", "blue", "red"] * 100
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda w: sharded_ht.compute(w, lambda k, old: (old or 0) + 1), words))
+    print(f"Word counts: {sorted(sharded_ht.items())}")
+    print(f"get_or_insert 'teal': {sharded_ht.get_or_insert('teal', 0)}")
+    
+    print("\n" + "=" * 70)
+    print("7. MAPPED HASH TABLE (Persistent)")
+    print("=" * 70)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "fruits.ht")
+        compact_ht.save(path)
+        with MappedHashTable.open(path) as mapped_ht:
+            print(f"Mapped search 'kiwi': {mapped_ht.search('kiwi')}")
+            print(f"Mapped entries: {sorted(mapped_ht.items())}")
+    
+    print("\n" + "=" * 70)
+    print("8. CACHES (LRU / LFU / TTL)")
+    print("=" * 70)
+    
+    @cached(LRUCache(capacity=32))
+    def fib(n):
+        return n if n < 2 else fib(n - 1) + fib(n - 2)
+    
+    print(f"fib(30) = {fib(30)}, cache stats: {fib.cache.stats()}")
+    lfu = LFUCache(capacity=2)
+    lfu.put("a", 1)
+    lfu.put("b", 2)
+    lfu.get("a")
+    lfu.put("c", 3)   # evicts "b", the least frequently used
+    print(f"LFU keeps a: {'a' in lfu}, b: {'b' in lfu}, c: {'c' in lfu}")
@@ -0,0 +1,309 @@
+"""
+Hash Table Benchmarks: every hashtable.py design against dict
+
+Runs each (table, workload, size) case in a fresh worker process so peak
+RSS belongs to that case alone, then reports ops/sec, p50/p99 latency,
+peak RSS and bytes per entry. Results can be written as JSON and compared
+against a previous run to spot regressions.
+
+    python hashtable_benchmark.py --sizes 1e3 1e5 1e7 --output run.json
+    python hashtable_benchmark.py --output new.json --compare run.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import resource
+import sys
+import time
+
+from hashtable import (
+    AdvancedHashTable,
+    ChainingHashTable,
+    CompactHashTable,
+    DynamicHashTable,
+    SimpleHashTable,
+)
+
+INSERT, SEARCH, DELETE = 0, 1, 2
+
+# ============================================================================
+# TABLES UNDER TEST
+# ============================================================================
+
+class DictTable:
+    """Baseline: the built-in dict behind the common insert/search/delete API"""
+
+    def __init__(self, size=0):
+        self.data = {}
+
+    def insert(self, key, value):
+        self.data[key] = value
+
+    def search(self, key):
+        return self.data.get(key)
+
+    def delete(self, key):
+        return self.data.pop(key, None) is not None
+
+    @property
+    def count(self):
+        return len(self.data)
+
+
+class LenientAdvancedHashTable(AdvancedHashTable):
+    """AdvancedHashTable that reports misses like the other tables do"""
+
+    def search(self, key):
+        try:
+            return super().search(key)
+        except KeyError:
+            return None
+
+    def delete(self, key):
+        try:
+            super().delete(key)
+            return True
+        except KeyError:
+            return False
+
+
+# Fixed-size tables get one bucket per expected key, as a user would size them
+TABLES = {
+    'dict': lambda n: DictTable(),
+    'SimpleHashTable': lambda n: SimpleHashTable(),
+    'ChainingHashTable': lambda n: ChainingHashTable(max(n, 1)),
+    'DynamicHashTable': lambda n: DynamicHashTable(),
+    'AdvancedHashTable': lambda n: LenientAdvancedHashTable(max(n, 1)),
+    'CompactHashTable': lambda n: CompactHashTable(),
+}
+
+
+# ============================================================================
+# WORKLOADS - each returns (preload keys, [(op, key), ...])
+# ============================================================================
+
+def _random_ints(rng, n):
+    return [rng.getrandbits(62) for _ in range(n)]
+
+
+def insert_heavy(rng, n):
+    keys = _random_ints(rng, n)
+    ops = [(INSERT, k) if rng.random() < 0.9 else (SEARCH, rng.choice(keys)) for k in keys]
+    return [], ops
+
+
+def read_heavy(rng, n):
+    keys = _random_ints(rng, n)
+    extra = _random_ints(rng, n)
+    ops = [(SEARCH, rng.choice(keys)) if rng.random() < 0.95 else (INSERT, extra[i]) for i in range(n)]
+    return keys, ops
+
+
+def delete_heavy(rng, n):
+    keys = _random_ints(rng, n)
+    ops = []
+    for _ in range(n):
+        r = rng.random()
+        if r < 0.5:
+            ops.append((DELETE, rng.choice(keys)))
+        elif r < 0.8:
+            ops.append((INSERT, rng.choice(keys)))
+        else:
+            ops.append((SEARCH, rng.choice(keys)))
+    return keys, ops
+
+
+def zipfian(rng, n, s=1.1):
+    keys = _random_ints(rng, n)
+    weights = [1 / (rank ** s) for rank in range(1, n + 1)]
+    hot = rng.choices(keys, weights=weights, k=n)
+    ops = [(SEARCH, k) if rng.random() < 0.9 else (INSERT, k) for k in hot]
+    return keys, ops
+
+
+def sequential_int(rng, n):
+    ops = [(INSERT, i) for i in range(n)] + [(SEARCH, i) for i in range(n)]
+    return [], ops
+
+
+def long_string(rng, n, length=200):
+    prefix = 'x' * (length - 20)
+    keys = [f"{prefix}{rng.getrandbits(64):020d}" for _ in range(n)]
+    ops = [(INSERT, k) if rng.random() < 0.5 else (SEARCH, rng.choice(keys)) for k in keys]
+    return [], ops
+
+
+WORKLOADS = {
+    'insert_heavy': insert_heavy,
+    'read_heavy': read_heavy,
+    'delete_heavy': delete_heavy,
+    'zipfian': zipfian,
+    'sequential_int': sequential_int,
+    'long_string': long_string,
+}
+
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def _current_rss():
+    """Resident set size in bytes (Linux /proc, falling back to peak RSS)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        return _peak_rss()
+
+
+def _peak_rss():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def run_case(table_name, workload_name, size, seed=0, latency_samples=100_000):
+    """Run one case and return its metrics as a plain dict"""
+    rng = random.Random(seed)
+    preload, ops = WORKLOADS[workload_name](rng, size)
+    rss_before = _current_rss()
+
+    table = TABLES[table_name](size)
+    insert, search, delete = table.insert, table.search, table.delete
+    for k in preload:
+        insert(k, k)
+
+    # Time every `stride`-th op individually; the rest only count toward ops/sec
+    stride = max(1, len(ops) // latency_samples)
+    latencies = []
+    clock = time.perf_counter_ns
+    start = clock()
+    for i, (op, key) in enumerate(ops):
+        if i % stride == 0:
+            t0 = clock()
+            if op == SEARCH:
+                search(key)
+            elif op == INSERT:
+                insert(key, i)
+            else:
+                delete(key)
+            latencies.append(clock() - t0)
+        elif op == SEARCH:
+            search(key)
+        elif op == INSERT:
+            insert(key, i)
+        else:
+            delete(key)
+    elapsed = (clock() - start) / 1e9
+
+    latencies.sort()
+    entries = table.count
+    return {
+        'table': table_name,
+        'workload': workload_name,
+        'size': size,
+        'ops': len(ops),
+        'ops_per_sec': len(ops) / elapsed if elapsed else float('inf'),
+        'p50_ns': _percentile(latencies, 0.50),
+        'p99_ns': _percentile(latencies, 0.99),
+        'peak_rss_bytes': _peak_rss(),
+        'bytes_per_entry': (_current_rss() - rss_before) / entries if entries else 0.0,
+        'entries': entries,
+    }
+
+
+def _run_case_args(args):
+    return run_case(*args)
+
+
+def run_suite(tables, workloads, sizes, seed=0, isolate=True):
+    """Run the cross product of cases, each in its own process when isolated"""
+    cases = [(t, w, s, seed) for s in sizes for w in workloads for t in tables]
+    if not isolate:
+        return [run_case(*case) for case in cases]
+    # One task per child keeps peak RSS from leaking across cases
+    ctx = multiprocessing.get_context('spawn')
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        return list(pool.imap(_run_case_args, cases))
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+def _metadata():
+    return {
+        'python': sys.version,
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def print_table(results):
+    header = f"{'table':<18} {'workload':<15} {'size':>9} {'ops/sec':>12} {'p50 ns':>9} {'p99 ns':>9} {'B/entry':>9} {'peak MB':>9}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['table']:<18} {r['workload']:<15} {r['size']:>9} {r['ops_per_sec']:>12.0f} "
+              f"{r['p50_ns']:>9} {r['p99_ns']:>9} {r['bytes_per_entry']:>9.1f} {r['peak_rss_bytes'] / 2**20:>9.1f}")
+
+
+def compare(results, baseline, threshold=0.10):
+    """Return cases whose ops/sec or p99 regressed by more than threshold"""
+    key = lambda r: (r['table'], r['workload'], r['size'])
+    old = {key(r): r for r in baseline['results']}
+    regressions = []
+    for r in results:
+        before = old.get(key(r))
+        if before is None:
+            continue
+        speed = r['ops_per_sec'] / before['ops_per_sec'] - 1 if before['ops_per_sec'] else 0.0
+        tail = r['p99_ns'] / before['p99_ns'] - 1 if before['p99_ns'] else 0.0
+        if speed < -threshold or tail > threshold:
+            regressions.append({'case': key(r), 'ops_per_sec_change': speed, 'p99_change': tail})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tables', nargs='+', default=list(TABLES), choices=list(TABLES))
+    parser.add_argument('--workloads', nargs='+', default=list(WORKLOADS), choices=list(WORKLOADS))
+    parser.add_argument('--sizes', nargs='+', default=['1e3', '1e4', '1e5'],
+                        help="key counts, e.g. 1e3 1e5 1e7")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--inline', action='store_true', help="run in this process (RSS is then cumulative)")
+    parser.add_argument('--output', help="write JSON results to this path")
+    parser.add_argument('--compare', help="JSON results of an earlier run to diff against")
+    parser.add_argument('--threshold', type=float, default=0.10, help="relative change that counts as a regression")
+    args = parser.parse_args(argv)
+
+    sizes = [int(float(s)) for s in args.sizes]
+    results = run_suite(args.tables, args.workloads, sizes, args.seed, isolate=not args.inline)
+    print_table(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'metadata': _metadata(), 'results': results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for reg in regressions:
+            print(f"REGRESSION {reg['case']}: ops/sec {reg['ops_per_sec_change']:+.1%}, p99 {reg['p99_change']:+.1%}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
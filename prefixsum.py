@@ -1,10 +1,19 @@
-arr=[4 ,7, 1, 3, 2]
-prefix_sum = [0] * len(arr)
-prefix_sum[0] = arr[0]
-for i in range(1, len(arr)):
-    prefix_sum[i] = prefix_sum[i-1] + arr[i]
-print(prefix_sum)
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, islice
+import mmap
+import multiprocessing
+from multiprocessing import shared_memory
+from numbers import Integral
+import operator
+import os
+import random
+import time
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; PrefixSumIndex falls back to lists
+    np = None
 
 # Challenge 1: Range Sum Query
 def rangeSum(prefix_sum, left, right):
@@ -12,7 +21,290 @@ def rangeSum(prefix_sum, left, right):
         return prefix_sum[right]
     return prefix_sum[right] - prefix_sum[left - 1]
 
-print("Range sum [1,3]:", rangeSum(prefix_sum, 1, 3))
+# Prefix-sum index: build once, answer single or batched range queries
+class PrefixSumIndex:
+    """Inclusive range sums over a fixed-length array.
+
+    backend='prefix' keeps a prefix array (P[0] = 0, P[i + 1] = arr[0..i]):
+    O(1) queries, O(n) updates. backend='fenwick' keeps a Fenwick tree:
+    O(log n) queries and updates, for write-heavy workloads. Uses NumPy
+    when it is installed and the values are numeric, lists otherwise.
+    NumPy arrays accumulate in int64 or float64 and widen to float64 (or
+    fall back to lists) when add() gets a delta their dtype cannot hold.
+    """
+
+    def __init__(self, values, backend='prefix'):
+        if backend not in ('prefix', 'fenwick'):
+            raise ValueError(f"unknown backend {backend!r}")
+        self.backend = backend
+        self.values = self._as_array(values)
+        n = len(self.values)
+        if np is not None and isinstance(self.values, np.ndarray):
+            prefix = np.zeros(n + 1, dtype=self.values.dtype)
+            np.cumsum(self.values, out=prefix[1:])
+        else:
+            prefix = list(accumulate(self.values, initial=0))
+        if backend == 'prefix':
+            self.tree = prefix
+        else:
+            # Fenwick node i (1-based) holds the sum of the lowbit(i) values ending at i
+            if isinstance(prefix, list):
+                self.tree = [0] + [prefix[i] - prefix[i - (i & -i)] for i in range(1, n + 1)]
+            else:
+                i = np.arange(1, n + 1)
+                self.tree = prefix.copy()
+                self.tree[1:] = prefix[i] - prefix[i - (i & -i)]
+
+    @staticmethod
+    def _as_array(values):
+        if np is not None:
+            arr = np.asarray(values)
+            if arr.ndim == 1 and arr.dtype.kind in 'iufb':
+                # Narrow dtypes would overflow or round once values are summed
+                return arr.astype(np.float64 if arr.dtype.kind == 'f' else np.int64)
+        return list(values)
+
+    def _widen_for(self, delta):
+        """Make sure the NumPy arrays can hold delta before anything is written"""
+        if np is None or not isinstance(self.values, np.ndarray):
+            return
+        if isinstance(delta, Integral) and -2**63 <= delta < 2**63:
+            return
+        if isinstance(delta, (float, np.floating)):
+            if self.values.dtype.kind == 'i':
+                self.values = self.values.astype(np.float64)
+                self.tree = self.tree.astype(np.float64)
+            return
+        # Big ints, Fraction, Decimal, complex...: keep exact Python semantics
+        self.values, self.tree = self.values.tolist(), self.tree.tolist()
+
+    def __len__(self):
+        return len(self.values)
+
+    def _prefix(self, i):
+        """Sum of the first i values"""
+        if self.backend == 'prefix':
+            return self.tree[i]
+        tree, total = self.tree, 0
+        while i > 0:
+            total += tree[i]
+            i &= i - 1
+        return total
+
+    def _prefix_many(self, idx):
+        if self.backend == 'prefix':
+            return self.tree[idx]
+        # All queries climb the tree together: at most log2(n) vectorized
+        # steps. Finished queries sit at index 0, where tree[0] == 0
+        total = np.zeros(len(idx), dtype=self.tree.dtype)
+        idx = idx.copy()
+        while idx.any():
+            total += self.tree[idx]
+            idx &= idx - 1
+        return total
+
+    def range_sum(self, left, right):
+        """Sum of values[left..right]; lefts/rights may also be sequences of queries"""
+        if isinstance(left, Integral) and isinstance(right, Integral):
+            return self._prefix(right + 1) - self._prefix(left)
+        if np is not None and isinstance(self.tree, np.ndarray):
+            lefts, rights = np.asarray(left, dtype=np.int64), np.asarray(right, dtype=np.int64)
+            return self._prefix_many(rights + 1) - self._prefix_many(lefts)
+        return [self._prefix(r + 1) - self._prefix(l) for l, r in zip(left, right)]
+
+    def total(self):
+        return self._prefix(len(self.values))
+
+    def add(self, i, delta):
+        """values[i] += delta"""
+        self._widen_for(delta)
+        self.values[i] += delta
+        tree, n = self.tree, len(self.values)
+        if self.backend == 'prefix':
+            if isinstance(tree, list):
+                for j in range(i + 1, n + 1):
+                    tree[j] += delta
+            else:
+                tree[i + 1:] += delta
+            return
+        i += 1
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    def update(self, i, value):
+        """values[i] = value"""
+        self.add(i, value - self.values[i])
+
+# N-D prefix sums (summed-area tables): box sums by inclusion-exclusion
+class SummedAreaTable:
+    """Sums over axis-aligned boxes of an N-D grid in O(2^d) per query.
+
+    table[i0 + 1, i1 + 1, ...] holds the sum of data[:i0 + 1, :i1 + 1, ...],
+    with a zero border at index 0 on every axis, so a box is the signed sum
+    of its 2^d corners. Stored as a NumPy array when NumPy is installed,
+    otherwise as a flat row-major array('q') / array('d'). append_rows()
+    grows the grid along axis 0 without rebuilding what is already there.
+    """
+
+    def __init__(self, data=None, shape=None):
+        # shape is the per-row shape (axes 1..d-1), needed only when data is empty
+        if data is not None and shape is None:
+            shape = self._shape(data)[1:]
+        if shape is None:
+            raise ValueError("pass data or the shape of one row")
+        self.row_shape = tuple(shape)
+        self.rows = 0
+        padded = [s + 1 for s in self.row_shape]
+        self._row_size = 1
+        for s in padded:
+            self._row_size *= s
+        if np is not None:
+            self._buf = np.zeros([1] + padded, dtype=np.int64)
+        else:
+            self._buf = array('q', [0]) * self._row_size
+        if data is not None:
+            self.append_rows(data)
+
+    @staticmethod
+    def _shape(data):
+        if np is not None:
+            return np.shape(data)
+        shape = []
+        while isinstance(data, (list, tuple)):
+            shape.append(len(data))
+            data = data[0] if data else None
+        return tuple(shape)
+
+    @property
+    def shape(self):
+        return (self.rows,) + self.row_shape
+
+    @property
+    def table(self):
+        if np is not None:
+            return self._buf[:self.rows + 1]
+        return self._buf
+
+    def append_rows(self, rows):
+        """Extend the grid along axis 0; each new table row is O(row size)"""
+        if len(rows) == 0:
+            return
+        if np is not None:
+            rows = np.asarray(rows)
+            if rows.shape[1:] != self.row_shape:
+                raise ValueError(f"rows must have shape (k, {', '.join(map(str, self.row_shape))})")
+            if rows.dtype.kind == 'f' and self._buf.dtype.kind != 'f':
+                self._buf = self._buf.astype(np.float64)
+            k = len(rows)
+            need = self.rows + 1 + k
+            if need > len(self._buf):
+                # Grow capacity geometrically so appends are amortized O(1) per row
+                grown = np.zeros((max(need, 2 * len(self._buf)),) + self._buf.shape[1:], dtype=self._buf.dtype)
+                grown[:self.rows + 1] = self._buf[:self.rows + 1]
+                self._buf = grown
+            block = self._buf[self.rows + 1:need]
+            block[(slice(None),) + (slice(1, None),) * len(self.row_shape)] = rows
+            for axis in range(len(self.shape)):
+                np.cumsum(block, axis=axis, out=block)
+            block += self._buf[self.rows]
+            self.rows += k
+            return
+        for row in rows:
+            self._append_row_flat(row)
+
+    def _append_row_flat(self, row):
+        flat = [0] * self._row_size
+        padded = [s + 1 for s in self.row_shape]
+        # Scatter the row into the padded layout (index 0 on each axis stays 0)
+        stack = [(row, 0, 0)]
+        while stack:
+            item, depth, offset = stack.pop()
+            if depth == len(padded):
+                flat[offset] = item
+                continue
+            if len(item) != self.row_shape[depth]:
+                raise ValueError(f"row length {len(item)} does not match shape {self.row_shape}")
+            stride = 1
+            for s in padded[depth + 1:]:
+                stride *= s
+            for i, sub in enumerate(item):
+                stack.append((sub, depth + 1, offset + (i + 1) * stride))
+        # Running sums along each in-row axis, then add the previous table row
+        stride = self._row_size
+        for length in padded:
+            stride //= length
+            for i in range(self._row_size):
+                if (i // stride) % length:
+                    flat[i] += flat[i - stride]
+        prev = len(self._buf) - self._row_size
+        if self._buf.typecode == 'q' and any(isinstance(v, float) for v in flat):
+            self._buf = array('d', self._buf)
+        self._buf.extend(flat[i] + self._buf[prev + i] for i in range(self._row_size))
+        self.rows += 1
+
+    def box_sum(self, lows, highs):
+        """Sum over lows..highs inclusive on every axis.
+
+        lows/highs are one index tuple, or (q, d) sequences of q boxes
+        answered together.
+        """
+        d = len(self.shape)
+        if np is not None:
+            lows, highs = np.asarray(lows, dtype=np.int64), np.asarray(highs, dtype=np.int64)
+            single = lows.ndim == 1
+            lows, highs = np.atleast_2d(lows), np.atleast_2d(highs)
+            if lows.shape != highs.shape or lows.shape[1] != d:
+                raise ValueError(f"boxes need {d} low and {d} high indices each")
+            if (lows < 0).any() or (highs >= np.array(self.shape)).any():
+                raise IndexError(f"box out of range for shape {self.shape}")
+            if (lows > highs).any():
+                raise ValueError("box has a low index above its high index")
+            highs = highs + 1
+            # Spare capacity rows past self.rows must never be read
+            table = self.table
+            total = np.zeros(len(lows), dtype=table.dtype)
+            for corner in range(1 << d):
+                pick = [(corner >> a) & 1 for a in range(d)]
+                idx = tuple(np.where(pick[a], highs[:, a], lows[:, a]) for a in range(d))
+                if (d - sum(pick)) % 2:
+                    total -= table[idx]
+                else:
+                    total += table[idx]
+            return total[0] if single else total
+        if lows and isinstance(lows[0], Integral):
+            return self._box_sum_flat(lows, highs)
+        return [self._box_sum_flat(lo, hi) for lo, hi in zip(lows, highs)]
+
+    def _box_sum_flat(self, lows, highs):
+        shape = self.shape
+        if len(lows) != len(shape) or len(highs) != len(shape):
+            raise ValueError(f"boxes need {len(shape)} low and {len(shape)} high indices each")
+        for lo, hi, size in zip(lows, highs, shape):
+            if lo < 0 or hi >= size:
+                raise IndexError(f"box out of range for shape {shape}")
+            if lo > hi:
+                raise ValueError("box has a low index above its high index")
+        strides = []
+        stride = 1
+        for s in reversed(self.row_shape):
+            strides.append(stride)
+            stride *= s + 1
+        strides.append(stride)
+        strides.reverse()
+        total = 0
+        d = len(strides)
+        for corner in range(1 << d):
+            offset = 0
+            sign = 1
+            for a in range(d):
+                if (corner >> a) & 1:
+                    offset += (highs[a] + 1) * strides[a]
+                else:
+                    offset += lows[a] * strides[a]
+                    sign = -sign
+            total += sign * self._buf[offset]
+        return total
 
 # Challenge 2: Find equilibrium point (sum of left = sum of right)
 def equilibriumPoint(arr):
@@ -31,14 +323,96 @@ def equilibriumPoint(arr):
     return -1
 
 # Challenge 3: Count subarrays with sum equals K
+# A subarray arr[i..j] sums to k exactly when prefix[j] - prefix[i-1] == k,
+# so one pass counting how often each prefix sum has been seen is enough
 def subarraySum(arr, k):
     count = 0
-    for i in range(len(arr)):
-        current_sum = 0
-        for j in range(i, len(arr)):
-            current_sum += arr[j]
-            if current_sum == k:
-                count += 1
+    seen = {0: 1}
+    current_sum = 0
+    for num in arr:
+        current_sum += num
+        count += seen.get(current_sum - k, 0)
+        seen[current_sum] = seen.get(current_sum, 0) + 1
+    return count
+
+# Challenge 3b: Counts for many K values in the same pass, O(n * len(ks))
+def subarraySumCounts(arr, ks):
+    ks = list(dict.fromkeys(ks))
+    counts = dict.fromkeys(ks, 0)
+    seen = {0: 1}
+    current_sum = 0
+    for num in arr:
+        current_sum += num
+        for k in ks:
+            counts[k] += seen.get(current_sum - k, 0)
+        seen[current_sum] = seen.get(current_sum, 0) + 1
+    return counts
+
+# Challenge 3c: Longest subarray with sum equals K (remember first occurrences)
+def longestSubarrayWithSum(arr, k):
+    first = {0: -1}
+    current_sum = 0
+    best = 0
+    for i, num in enumerate(arr):
+        current_sum += num
+        start = first.get(current_sum - k)
+        if start is not None and i - start > best:
+            best = i - start
+        first.setdefault(current_sum, i)
+    return best
+
+# Challenge 3d: Count subarrays with lo <= sum <= hi, O(n log n)
+# Counts pairs i < j of prefix sums with lo <= P[j] - P[i] <= hi
+def countSubarraysInRange(arr, lo, hi):
+    prefix = list(accumulate(arr, initial=0))
+    if np is not None and len(prefix) > 256:
+        prefix_arr = np.asarray(prefix)
+        if prefix_arr.dtype.kind in 'iuf':
+            return _countPairsInRangeNumpy(prefix_arr, lo, hi)
+    # Fenwick tree over the ranks of the prefix sums seen so far
+    uniq = sorted(set(prefix))
+    rank = {p: i + 1 for i, p in enumerate(uniq)}
+    tree = [0] * (len(uniq) + 1)
+    count = 0
+    for p in prefix:
+        i = bisect_right(uniq, p - lo)
+        while i > 0:
+            count += tree[i]
+            i &= i - 1
+        i = bisect_left(uniq, p - hi)
+        while i > 0:
+            count -= tree[i]
+            i &= i - 1
+        i = rank[p]
+        while i < len(tree):
+            tree[i] += 1
+            i += i & -i
+    return count
+
+def _countPairsInRangeNumpy(prefix, lo, hi):
+    """Bottom-up merge-sort count, one vectorized pass per level"""
+    uniq = np.unique(prefix)
+    n, m = len(prefix), len(uniq) + 1
+    # For each j, valid i have rank in [lows[j], highs[j])
+    lows = np.searchsorted(uniq, prefix - hi, 'left')
+    highs = np.searchsorted(uniq, prefix - lo, 'right')
+    ranks = np.searchsorted(uniq, prefix)
+    pos = np.arange(n)
+    count = 0
+    width = 1
+    while width < n:
+        # Ranks are sorted within blocks of `width`; pair block 2b (left)
+        # with block 2b + 1 (right) and count matches across them
+        block = pos // width
+        pair = block >> 1
+        left = (block & 1) == 0
+        keys = pair[left] * m + ranks[left]
+        right = ~left
+        base = pair[right] * m
+        count += int((np.searchsorted(keys, base + highs[right]) - np.searchsorted(keys, base + lows[right])).sum())
+        # Merge each pair of blocks: stable sort on (pair, rank) merges the runs
+        ranks = ranks[np.argsort(pair * m + ranks, kind='stable')]
+        width *= 2
     return count
 
 # Challenge 4: Maximum subarray sum (Kadane's with prefix)
@@ -64,4 +438,333 @@ def productExceptSelf(arr):
         suffix_prod *= arr[i]
     return result
 
-print("Product except self:", productExceptSelf(arr))
\ No newline at end of file
+# Streaming variants: fixed-size chunks, state carried across chunk
+# boundaries, memory independent of the input length. `source` is any
+# iterable of numbers or a sliceable buffer (array, memoryview, np.memmap).
+def openSeries(path, typecode='d', writable=False):
+    """Memory-map a raw binary file of one numeric type as a flat buffer"""
+    if np is not None:
+        return np.memmap(path, dtype=np.dtype(typecode), mode='r+' if writable else 'r')
+    with open(path, 'r+b' if writable else 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+    return memoryview(mapped).cast(typecode)
+
+def _chunks(source, chunk_size, reverse=False):
+    if hasattr(source, '__getitem__') and hasattr(source, '__len__'):
+        n = len(source)
+        starts = range(0, n, chunk_size)
+        for start in (reversed(starts) if reverse else starts):
+            chunk = source[start:start + chunk_size]
+            yield np.asarray(chunk) if np is not None else chunk
+        return
+    if reverse:
+        raise TypeError("a backward pass needs a sliceable buffer, not an iterator")
+    it = iter(source)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        yield np.asarray(chunk) if np is not None else chunk
+
+def maxSubarraySumStream(source, chunk_size=1 << 16):
+    """Kadane in one pass; best = max over j of P[j] - min(P[i], i < j)"""
+    best = None
+    if np is not None:
+        offset = 0      # prefix sum before the chunk
+        low = 0         # smallest prefix sum seen so far (P[-1] = 0 included)
+        for chunk in _chunks(source, chunk_size):
+            if not len(chunk):
+                continue
+            prefix = np.cumsum(chunk) + offset
+            lows = np.minimum.accumulate(np.concatenate(([low], prefix[:-1])))
+            chunk_best = (prefix - lows).max()
+            best = chunk_best if best is None else max(best, chunk_best)
+            offset = prefix[-1]
+            low = min(low, prefix.min())
+        if best is None:
+            raise ValueError("maxSubarraySumStream() of an empty series")
+        return best.item()
+    current_sum = 0
+    for chunk in _chunks(source, chunk_size):
+        for num in chunk:
+            current_sum = max(num, current_sum + num)
+            best = current_sum if best is None else max(best, current_sum)
+    if best is None:
+        raise ValueError("maxSubarraySumStream() of an empty series")
+    return best
+
+def equilibriumPointStream(source, chunk_size=1 << 16, total=None):
+    """First i with sum(left of i) == sum(right of i), or -1.
+
+    i is an equilibrium exactly when 2 * left_sum + arr[i] == total. With
+    `total` known (or the source a buffer, where it is summed first) this
+    is one constant-memory pass. A one-shot iterator is instead scanned
+    once while remembering the first index of each 2 * left_sum + arr[i],
+    which costs memory per distinct value.
+    """
+    if total is None and hasattr(source, '__len__'):
+        total = sum(chunk.sum() if np is not None else sum(chunk) for chunk in _chunks(source, chunk_size))
+    first = {} if total is None else None
+    left_sum = 0
+    index = 0
+    for chunk in _chunks(source, chunk_size):
+        if np is not None and len(chunk):
+            keys = 2 * (np.cumsum(chunk) - chunk + left_sum) + chunk
+            if first is None:
+                hits = np.flatnonzero(keys == total)
+                if len(hits):
+                    return index + int(hits[0])
+            else:
+                for i, key in enumerate(keys.tolist()):
+                    first.setdefault(key, index + i)
+            left_sum += chunk.sum()
+            index += len(chunk)
+            continue
+        for num in chunk:
+            key = 2 * left_sum + num
+            if first is None:
+                if key == total:
+                    return index
+            else:
+                first.setdefault(key, index)
+            left_sum += num
+            index += 1
+    if first is None:
+        return -1
+    return first.get(left_sum, -1)
+
+def _intWrapper(typecode):
+    """Reduce Python ints to an integer typecode's width, as NumPy arithmetic does"""
+    if typecode in 'fd':
+        return None
+    bits = 8 * array(typecode).itemsize
+    mask = (1 << bits) - 1
+    if typecode.isupper():
+        return lambda x: x & mask
+    half = 1 << (bits - 1)
+    return lambda x: ((x + half) & mask) - half
+
+def productExceptSelfStream(source, out=None, chunk_size=1 << 16):
+    """productExceptSelf with a forward and a backward pass over chunks.
+
+    `out` is a writable buffer of len(source), a path for a new memory-mapped
+    output file, or None for an in-memory array. Results take the input's
+    element type, so large integer products wrap around to that type's
+    width (two's complement), with or without NumPy.
+    """
+    n = len(source)
+    if np is not None:
+        typecode = np.asarray(source[:1]).dtype.char
+    else:
+        typecode = (getattr(source, 'typecode', None) or getattr(source, 'format', None)
+                    or ('q' if n and isinstance(source[0], int) else 'd'))
+    if out is None:
+        out = np.empty(n, dtype=typecode) if np is not None else array(typecode, bytes(n * array(typecode).itemsize))
+    elif isinstance(out, str):
+        if np is not None:
+            out = np.memmap(out, dtype=typecode, mode='w+', shape=(n,))
+        else:
+            with open(out, 'wb') as f:
+                f.truncate(n * array(typecode).itemsize)
+            out = openSeries(out, typecode, writable=True)
+    wrap = _intWrapper(typecode) if np is None else None
+    # Forward: out[i] = product of everything before i
+    carry = 1
+    start = 0
+    for chunk in _chunks(source, chunk_size):
+        if np is not None:
+            products = np.cumprod(chunk)
+            out[start] = carry
+            out[start + 1:start + len(chunk)] = products[:-1] * carry
+            carry = carry * products[-1]
+        else:
+            for i, num in enumerate(chunk):
+                out[start + i] = carry
+                carry = carry * num if wrap is None else wrap(carry * num)
+        start += len(chunk)
+    # Backward: multiply in the product of everything after i
+    carry = 1
+    end = n
+    for chunk in _chunks(source, chunk_size, reverse=True):
+        start = end - len(chunk)
+        if np is not None:
+            products = np.cumprod(chunk[::-1])[::-1]
+            out[end - 1] *= carry
+            out[start:end - 1] *= products[1:] * carry
+            carry = carry * products[0]
+        else:
+            for i in range(len(chunk) - 1, -1, -1):
+                product = out[start + i] * carry
+                out[start + i] = product if wrap is None else wrap(product)
+                carry = carry * chunk[i] if wrap is None else wrap(carry * chunk[i])
+        end = start
+    if hasattr(out, 'flush'):
+        out.flush()
+    return out
+
+
+# Benchmark: ns per element should stay flat (O(n)) or grow like log n
+def benchmarkSubarraySums(sizes=(10**5, 10**6, 10**7), seed=0):
+    """Return one row per size: n plus ns per element for each variant"""
+    rng = random.Random(seed)
+    ks = range(-50, 51, 10)
+    results = []
+    for n in sizes:
+        data = [rng.randint(-100, 100) for _ in range(n)]
+        row = {'n': n}
+        for name, run in (('subarraySum', lambda: subarraySum(data, 50)),
+                          ('longestSubarrayWithSum', lambda: longestSubarrayWithSum(data, 50)),
+                          ('subarraySumCounts', lambda: subarraySumCounts(data, ks)),
+                          ('countSubarraysInRange', lambda: countSubarraysInRange(data, -50, 50))):
+            start = time.perf_counter()
+            run()
+            row[name] = (time.perf_counter() - start) / n * 1e9
+        results.append(row)
+    return results
+
+# Parallel prefix scan over a process pool: each worker scans one chunk of
+# a shared-memory buffer in place, the chunk totals are scanned serially,
+# then a second parallel pass folds each chunk's offset in. 2n work in all.
+_SCAN_OPS = {
+    'sum': (operator.add, 'add'),
+    'product': (operator.mul, 'multiply'),
+    'max': (max, 'maximum'),
+    'min': (min, 'minimum'),
+}
+
+# Per-worker view of the shared buffer, set by _attachScanBuffer
+_shared_scan = {}
+
+def _scanFunctions(op):
+    """(binary Python function, NumPy ufunc or None) for an op name or callable"""
+    if op in _SCAN_OPS:
+        fn, ufunc_name = _SCAN_OPS[op]
+        return fn, getattr(np, ufunc_name) if np is not None else None
+    if np is not None and isinstance(op, np.ufunc):
+        return op, op
+    if callable(op):
+        return op, None
+    raise ValueError(f"op must be one of {sorted(_SCAN_OPS)} or a binary function")
+
+def _attachScanBuffer(name, typecode, n):
+    # Map the scan buffer only: parallel_prefix_sum created the segment and
+    # unlinks it after the offset pass, so a worker must never unlink it
+    block = shared_memory.SharedMemory(name=name)
+    _shared_scan['block'] = block
+    if np is not None:
+        _shared_scan['data'] = np.frombuffer(block.buf, dtype=typecode, count=n)
+    else:
+        _shared_scan['data'] = block.buf.cast(typecode)[:n]
+
+def _scanChunk(task):
+    """Inclusive scan of data[start:end] in place; returns the chunk total"""
+    start, end, op = task
+    data = _shared_scan['data']
+    fn, ufunc = _scanFunctions(op)
+    if ufunc is not None:
+        segment = data[start:end]
+        ufunc.accumulate(segment, out=segment)
+        return segment[-1].item()
+    acc = data[start]
+    for i in range(start + 1, end):
+        acc = fn(acc, data[i])
+        data[i] = acc
+    return acc
+
+def _offsetChunk(task):
+    start, end, op, offset = task
+    data = _shared_scan['data']
+    fn, ufunc = _scanFunctions(op)
+    if ufunc is not None:
+        segment = data[start:end]
+        ufunc(offset, segment, out=segment)
+        return
+    for i in range(start, end):
+        data[i] = fn(offset, data[i])
+
+def parallel_prefix_sum(buf, workers=None, op='sum'):
+    """Inclusive scan of buf under an associative op, split across processes.
+
+    op is 'sum', 'product', 'max', 'min', a NumPy ufunc, or any picklable
+    associative binary function. Values are stored as int64 or float64
+    (like buf), so integer products can overflow. Returns a NumPy array
+    when NumPy is installed, otherwise an array('q') / array('d').
+    """
+    fn, ufunc = _scanFunctions(op)
+    if np is not None:
+        values = np.asarray(buf)
+        typecode = 'd' if values.dtype.kind == 'f' else 'q'
+        values = values.astype(typecode, copy=False)
+    else:
+        typecode = getattr(buf, 'typecode', None)
+        if typecode not in ('q', 'd'):
+            typecode = 'd' if any(isinstance(v, float) for v in buf) else 'q'
+        values = buf if getattr(buf, 'typecode', None) == typecode else array(typecode, buf)
+    n = len(values)
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if workers <= 1 or n < 2 * workers:
+        if ufunc is not None:
+            return ufunc.accumulate(values)
+        return array(typecode, accumulate(values, fn))
+
+    itemsize = array(typecode).itemsize
+    block = shared_memory.SharedMemory(create=True, size=n * itemsize)
+    try:
+        if np is not None:
+            np.frombuffer(block.buf, dtype=typecode, count=n)[:] = values
+        else:
+            block.buf[:n * itemsize] = values.tobytes()
+        bounds = [n * w // workers for w in range(workers + 1)]
+        chunks = list(zip(bounds, bounds[1:]))
+        with multiprocessing.Pool(workers, initializer=_attachScanBuffer, initargs=(block.name, typecode, n)) as pool:
+            totals = pool.map(_scanChunk, [(start, end, op) for start, end in chunks])
+            # Chunk c needs the combined totals of chunks 0..c-1
+            offsets = list(accumulate(totals[:-1], fn))
+            pool.map(_offsetChunk, [(start, end, op, offset) for (start, end), offset in zip(chunks[1:], offsets)])
+        if np is not None:
+            return np.frombuffer(block.buf, dtype=typecode, count=n).copy()
+        result = array(typecode)
+        result.frombytes(block.buf[:n * itemsize])
+        return result
+    finally:
+        block.close()
+        block.unlink()
+
+def maxSubarraySumParallel(buf, workers=None):
+    """Kadane's answer from two parallel scans: max over j of P[j] - min(0, P[:j])"""
+    prefix = parallel_prefix_sum(buf, workers)
+    lows = parallel_prefix_sum(prefix, workers, op='min')
+    if np is not None:
+        before = np.minimum(np.concatenate(([0], lows[:-1])), 0)
+        return (prefix - before).max().item()
+    best = prefix[0]
+    for j in range(1, len(prefix)):
+        best = max(best, prefix[j] - min(lows[j - 1], 0))
+    return best
+
+
+if __name__ == "__main__":
+    arr=[4 ,7, 1, 3, 2]
+    prefix_sum = [0] * len(arr)
+    prefix_sum[0] = arr[0]
+    for i in range(1, len(arr)):
+        prefix_sum[i] = prefix_sum[i-1] + arr[i]
+    print(prefix_sum)
+    print("Range sum [1,3]:", rangeSum(prefix_sum, 1, 3))
+    print("Product except self:", productExceptSelf(arr))
+    index = PrefixSumIndex(arr)
+    print("Batched range sums [0,2], [1,3]:", index.range_sum([0, 1], [2, 3]))
+    print("Subarrays summing to 8:", subarraySum(arr, 8), "longest:", longestSubarrayWithSum(arr, 8),
+          "with sum in [5, 10]:", countSubarraysInRange(arr, 5, 10))
+    # benchmarkSubarraySums() with defaults runs up to 10**7 elements
+    for row in benchmarkSubarraySums(sizes=(10**4, 10**5)):
+        print(f"n={row['n']:>10}: " + ", ".join(f"{k} {v:.0f} ns/elem" for k, v in row.items() if k != 'n'))
+    grid = SummedAreaTable([[1, 2, 3], [4, 5, 6]])
+    grid.append_rows([[7, 8, 9]])
+    print("Box sum rows 1-2, cols 1-2:", grid.box_sum((1, 1), (2, 2)))
+    print("Streaming Kadane / equilibrium / product:", maxSubarraySumStream(iter(arr), chunk_size=2),
+          equilibriumPointStream(iter([1, 3, 5, 2, 2]), chunk_size=2),
+          productExceptSelfStream(array('q', arr), chunk_size=2).tolist())
+    print("Parallel prefix sum / max:", parallel_prefix_sum(list(range(1, 11)), workers=2).tolist(),
+          parallel_prefix_sum([3, 1, 4, 1, 5, 9, 2, 6], workers=2, op='max').tolist())
+    print("Parallel Kadane:", maxSubarraySumParallel([-2, 1, -3, 4, -1, 2, 1, -5, 4], workers=2))
@@ -0,0 +1,53 @@
+import pytest
+
+import prefixsum
+from prefixsum import PrefixSumIndex
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BACKENDS = ('prefix', 'fenwick')
+
+
+@pytest.fixture(params=['numpy', 'lists'])
+def numpy_mode(request, monkeypatch):
+    """Run each test with NumPy (when installed) and with the list fallback"""
+    if request.param == 'numpy' and np is None:
+        pytest.skip("NumPy is not installed")
+    if request.param == 'lists':
+        monkeypatch.setattr(prefixsum, 'np', None)
+    return request.param
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_fractional_delta_matches_list_fallback(numpy_mode, backend):
+    index = PrefixSumIndex([1, 2, 3], backend=backend)
+    index.add(0, 0.5)
+    assert index.total() == 6.5
+    assert index.range_sum(0, 0) == 1.5
+    assert list(index.range_sum([0, 1], [2, 2])) == [6.5, 5]
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_update_to_float_value(numpy_mode, backend):
+    index = PrefixSumIndex([1, 2, 3], backend=backend)
+    index.update(1, 2.25)
+    assert index.total() == 6.25
+    assert index.range_sum(1, 2) == 5.25
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_delta_too_big_for_int64(numpy_mode, backend):
+    index = PrefixSumIndex([1, 2, 3], backend=backend)
+    index.add(2, 2**70)
+    assert index.total() == 6 + 2**70
+    assert index.range_sum(0, 1) == 3
+
+
+@pytest.mark.skipif(np is None, reason="NumPy is not installed")
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_narrow_dtypes_accumulate_wide(backend):
+    assert PrefixSumIndex(np.array([100, 100, 100], dtype=np.int8), backend).range_sum(0, 2) == 300
+    assert PrefixSumIndex(np.array([1e8, 1, 1], dtype=np.float32), backend).range_sum(1, 2) == 2
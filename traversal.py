@@ -1,15 +1,38 @@
+from array import array
+import asyncio
 from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import fnmatch
+import itertools
+import multiprocessing
+from multiprocessing import shared_memory
 import os
-from typing import Any, Dict, List, Optional, Set
+import random
+import re
+import sqlite3
+import stat
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; CSR arrays fall back to array('q')
+    np = None
 
 """
 traversal.py
 
 Examples of common traversal techniques in Python:
 - Binary tree: recursive & iterative preorder, inorder, postorder, level-order (BFS)
-- Graph (adjacency list): DFS recursive, DFS iterative, BFS
+- Graph (adjacency list or CSRGraph): DFS recursive, DFS iterative, BFS
+- Lazy generators for all of the above: explicit stacks, early exit, pruning
+- Async BFS over neighbour lists fetched by coroutines, with bounded concurrency
 - Linked list: simple traversal
-- Filesystem: os.walk and manual stack-based traversal
+- Node pools: structure-of-arrays trees and lists behind a node-handle API
+- Filesystem: os.walk, manual stack-based traversal and a parallel os.scandir crawler
+- Filesystem index: sqlite snapshots re-scanned incrementally via directory mtimes
 
 Run as a script to see small demonstrations.
 """
@@ -20,6 +43,8 @@ Run as a script to see small demonstrations.
 # Binary tree traversals
 # -------------------------
 class TreeNode:
+    __slots__ = ('val', 'left', 'right')
+
     def __init__(self, val: Any, left: Optional["TreeNode"] = None, right: Optional["TreeNode"] = None):
         self.val = val
         self.left = left
@@ -53,7 +78,9 @@ def postorder_recursive(node: Optional[TreeNode], out: List[Any]) -> None:
     out.append(node.val)
 
 
-def preorder_iterative(root: Optional[TreeNode]) -> List[Any]:
+def preorder_iterative(root: Optional[TreeNode], morris: bool = False) -> List[Any]:
+    if morris:
+        return morris_preorder(root)
     if not root:
         return []
     stack = [root]
@@ -68,7 +95,9 @@ def preorder_iterative(root: Optional[TreeNode]) -> List[Any]:
     return out
 
 
-def inorder_iterative(root: Optional[TreeNode]) -> List[Any]:
+def inorder_iterative(root: Optional[TreeNode], morris: bool = False) -> List[Any]:
+    if morris:
+        return morris_inorder(root)
     out: List[Any] = []
     stack: List[TreeNode] = []
     curr = root
@@ -82,7 +111,9 @@ def inorder_iterative(root: Optional[TreeNode]) -> List[Any]:
     return out
 
 
-def postorder_iterative(root: Optional[TreeNode]) -> List[Any]:
+def postorder_iterative(root: Optional[TreeNode], morris: bool = False) -> List[Any]:
+    if morris:
+        return morris_postorder(root)
     # Two-stack method
     if not root:
         return []
@@ -117,10 +148,318 @@ def level_order_bfs(root: Optional[TreeNode]) -> List[List[Any]]:
     return levels
 
 
+# -------------------------
+# Morris (threaded) traversals: O(1) extra space
+# -------------------------
+# Each walk temporarily points the rightmost node of a left subtree back at
+# its inorder successor instead of remembering that successor on a stack.
+# Every thread is removed on the second visit, so the tree is unchanged
+# once the walk completes.
+def _predecessor(node: TreeNode) -> TreeNode:
+    """Rightmost node of node.left, stopping at an existing thread"""
+    pred = node.left
+    # != rather than `is not`, so pooled node handles compare by position
+    while pred.right and pred.right != node:
+        pred = pred.right
+    return pred
+
+
+def morris_inorder(root: Optional[TreeNode]) -> List[Any]:
+    out: List[Any] = []
+    curr = root
+    while curr:
+        if curr.left is None:
+            out.append(curr.val)
+            curr = curr.right
+            continue
+        pred = _predecessor(curr)
+        if pred.right is None:
+            pred.right = curr
+            curr = curr.left
+        else:
+            pred.right = None
+            out.append(curr.val)
+            curr = curr.right
+    return out
+
+
+def morris_preorder(root: Optional[TreeNode]) -> List[Any]:
+    out: List[Any] = []
+    curr = root
+    while curr:
+        if curr.left is None:
+            out.append(curr.val)
+            curr = curr.right
+            continue
+        pred = _predecessor(curr)
+        if pred.right is None:
+            out.append(curr.val)
+            pred.right = curr
+            curr = curr.left
+        else:
+            pred.right = None
+            curr = curr.right
+    return out
+
+
+def morris_postorder(root: Optional[TreeNode]) -> List[Any]:
+    out: List[Any] = []
+    # A dummy parent makes the whole tree some node's left subtree; pooled
+    # trees get a temporary pool node so the threads stay inside the pool
+    pool = getattr(root, 'pool', None)
+    dummy = TreeNode(None, root) if pool is None else pool.new(None, root)
+    curr: Optional[TreeNode] = dummy
+    while curr:
+        if curr.left is None:
+            curr = curr.right
+            continue
+        pred = _predecessor(curr)
+        if pred.right is None:
+            pred.right = curr
+            curr = curr.left
+            continue
+        pred.right = None
+        # Emit the right spine from curr.left down to pred, bottom-up:
+        # append it top-down, then reverse that tail of `out` in place
+        start = len(out)
+        node = curr.left
+        while node:
+            out.append(node.val)
+            node = node.right
+        i, j = start, len(out) - 1
+        while i < j:
+            out[i], out[j] = out[j], out[i]
+            i += 1
+            j -= 1
+        curr = curr.right
+    if pool is not None:
+        pool.pop()
+    return out
+
+
+def benchmark_morris(n: int = 100_000, repeat: int = 3) -> Dict[str, Dict[str, float]]:
+    """Time and peak traced memory of stack vs Morris walks on a random tree"""
+    rng = random.Random(0)
+    nodes = [TreeNode(i) for i in range(n)]
+    for i in range(1, n):
+        # Random binary tree: attach each node to a free slot of an earlier one
+        while True:
+            parent = nodes[rng.randrange(i)]
+            side = 'left' if rng.random() < 0.5 else 'right'
+            if getattr(parent, side) is None:
+                setattr(parent, side, nodes[i])
+                break
+    root = nodes[0] if nodes else None
+
+    walks = {
+        'inorder_stack': inorder_iterative, 'inorder_morris': morris_inorder,
+        'preorder_stack': preorder_iterative, 'preorder_morris': morris_preorder,
+        'postorder_stack': postorder_iterative, 'postorder_morris': morris_postorder,
+    }
+    results = {}
+    for name, walk in walks.items():
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            walk(root)
+            best = min(best, time.perf_counter() - start)
+        tracemalloc.start()
+        walk(root)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = {'seconds': best, 'peak_bytes': peak}
+    return results
+
+
+# -------------------------
+# Compressed sparse row graphs
+# -------------------------
+class CSRGraph:
+    """Directed graph in compressed sparse row form.
+
+    Vertex labels map to dense ids 0..n-1. The neighbours of vertex i are
+    targets[offsets[i]:offsets[i + 1]], so the whole edge set lives in two
+    flat int64 arrays instead of one Python list per vertex.
+    """
+
+    def __init__(self, labels: List[Any], offsets: array, targets: array):
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.offsets = offsets
+        self.targets = targets
+
+    @classmethod
+    def from_adjacency(cls, graph: Dict[Any, List[Any]]) -> "CSRGraph":
+        """Build from the dict-of-lists format the traversals take"""
+        labels = list(graph)
+        index = {label: i for i, label in enumerate(labels)}
+        for neighbors in graph.values():
+            for nei in neighbors:
+                if nei not in index:
+                    index[nei] = len(labels)
+                    labels.append(nei)
+        offsets = array('q', [0])
+        targets = array('q')
+        for label in labels:
+            targets.extend(index[nei] for nei in graph.get(label, ()))
+            offsets.append(len(targets))
+        return cls(labels, offsets, targets)
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Tuple[Any, Any]], labels: Optional[List[Any]] = None) -> "CSRGraph":
+        """Build from a stream of (source, target) pairs in one pass.
+
+        Neighbour order follows the stream. Passing `labels` fixes the id
+        order (and includes isolated vertices).
+        """
+        labels = list(labels) if labels is not None else []
+        index = {label: i for i, label in enumerate(labels)}
+        sources = array('q')
+        dests = array('q')
+        for u, v in edges:
+            for label in (u, v):
+                if label not in index:
+                    index[label] = len(labels)
+                    labels.append(label)
+            sources.append(index[u])
+            dests.append(index[v])
+
+        n = len(labels)
+        if np is not None:
+            src_ids = np.frombuffer(sources, dtype=np.int64)
+            order = np.argsort(src_ids, kind='stable')
+            counts = np.bincount(src_ids, minlength=n)
+            offsets = array('q', [0])
+            offsets.frombytes(np.cumsum(counts, dtype=np.int64).tobytes())
+            targets = array('q')
+            targets.frombytes(np.frombuffer(dests, dtype=np.int64)[order].tobytes())
+            return cls(labels, offsets, targets)
+
+        # Stable counting sort by source id
+        offsets = array('q', [0]) * (n + 1)
+        for u in sources:
+            offsets[u + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        fill = array('q', offsets)
+        targets = array('q', [0]) * len(dests)
+        for u, v in zip(sources, dests):
+            targets[fill[u]] = v
+            fill[u] += 1
+        return cls(labels, offsets, targets)
+
+    @property
+    def num_vertices(self) -> int:
+        return len(self.labels)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    def neighbor_ids(self, i: int) -> array:
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def neighbors(self, label: Any) -> List[Any]:
+        i = self.index.get(label)
+        if i is None:
+            return []
+        labels = self.labels
+        return [labels[j] for j in self.neighbor_ids(i)]
+
+    def get(self, label: Any, default: Any = None) -> Any:
+        """Dict-style neighbour lookup, so dict-based code also runs on CSR"""
+        if label not in self.index:
+            return default
+        return self.neighbors(label)
+
+    def as_numpy(self):
+        """Zero-copy NumPy views of (offsets, targets)"""
+        if np is None:
+            raise ImportError("as_numpy() requires NumPy")
+        return np.frombuffer(self.offsets, dtype=np.int64), np.frombuffer(self.targets, dtype=np.int64)
+
+    def reverse(self) -> "CSRGraph":
+        """Graph with every edge flipped (cached); same labels and ids"""
+        cached = self.__dict__.get('_reverse')
+        if cached is not None:
+            return cached
+        n = self.num_vertices
+        offsets, targets = self.offsets, self.targets
+        rev_offsets = array('q', [0]) * (n + 1)
+        rev_targets = array('q', [0]) * len(targets)
+        if np is not None:
+            offs, tgts = self.as_numpy()
+            sources = np.repeat(np.arange(n, dtype=np.int64), np.diff(offs))
+            order = np.argsort(tgts, kind='stable')
+            rev_offsets[1:] = array('q', np.cumsum(np.bincount(tgts, minlength=n)).astype(np.int64).tobytes())
+            np.frombuffer(rev_targets, dtype=np.int64)[:] = sources[order]
+        else:
+            # Stable counting sort of the edges by target
+            for v in targets:
+                rev_offsets[v + 1] += 1
+            for i in range(n):
+                rev_offsets[i + 1] += rev_offsets[i]
+            fill = array('q', rev_offsets)
+            for u in range(n):
+                for v in targets[offsets[u]:offsets[u + 1]]:
+                    rev_targets[fill[v]] = u
+                    fill[v] += 1
+        cached = CSRGraph.__new__(CSRGraph)
+        cached.labels, cached.index = self.labels, self.index
+        cached.offsets, cached.targets = rev_offsets, rev_targets
+        self._reverse = cached
+        return cached
+
+
+Graph = Union[Dict[Any, List[Any]], CSRGraph]
+
+
+def _csr_dfs_ids(graph: CSRGraph, src: int, seen: bytearray) -> List[int]:
+    """Preorder DFS over ids in exactly the recursive visiting order"""
+    offsets, targets = graph.offsets, graph.targets
+    seen[src] = 1
+    order = [src]
+    # Each frame is (vertex, position of its next unexplored edge)
+    stack = [(src, offsets[src])]
+    while stack:
+        node, pos = stack[-1]
+        end = offsets[node + 1]
+        while pos < end and seen[targets[pos]]:
+            pos += 1
+        if pos == end:
+            stack.pop()
+            continue
+        stack[-1] = (node, pos + 1)
+        nxt = targets[pos]
+        seen[nxt] = 1
+        order.append(nxt)
+        stack.append((nxt, offsets[nxt]))
+    return order
+
+
 # -------------------------
 # Graph traversals
 # -------------------------
-def dfs_recursive(graph: Dict[Any, List[Any]], src: Any, visited: Optional[Set[Any]] = None, out: Optional[List[Any]] = None):
+def dfs_recursive(graph: Graph, src: Any, visited: Optional[Set[Any]] = None, out: Optional[List[Any]] = None):
+    if isinstance(graph, CSRGraph):
+        if visited is None:
+            visited = set()
+        if out is None:
+            out = []
+        src_id = graph.index.get(src)
+        if src_id is None:
+            visited.add(src)
+            out.append(src)
+            return out
+        seen = bytearray(graph.num_vertices)
+        for label in visited:
+            if label in graph.index:
+                seen[graph.index[label]] = 1
+        labels = graph.labels
+        visited_now = [labels[i] for i in _csr_dfs_ids(graph, src_id, seen)]
+        visited.update(visited_now)
+        out.extend(visited_now)
+        return out
     if visited is None:
         visited = set()
     if out is None:
@@ -133,7 +472,27 @@ def dfs_recursive(graph: Dict[Any, List[Any]], src: Any, visited: Optional[Set[A
     return out
 
 
-def dfs_iterative(graph: Dict[Any, List[Any]], src: Any) -> List[Any]:
+def dfs_iterative(graph: Graph, src: Any) -> List[Any]:
+    if isinstance(graph, CSRGraph):
+        src_id = graph.index.get(src)
+        if src_id is None:
+            return [src]
+        offsets, targets = graph.offsets, graph.targets
+        seen = bytearray(graph.num_vertices)
+        stack = [src_id]
+        order: List[int] = []
+        while stack:
+            node = stack.pop()
+            if seen[node]:
+                continue
+            seen[node] = 1
+            order.append(node)
+            # push neighbors in reverse to mimic recursive order
+            for pos in range(offsets[node + 1] - 1, offsets[node] - 1, -1):
+                if not seen[targets[pos]]:
+                    stack.append(targets[pos])
+        labels = graph.labels
+        return [labels[i] for i in order]
     visited: Set[Any] = set()
     stack = [src]
     out: List[Any] = []
@@ -150,7 +509,26 @@ def dfs_iterative(graph: Dict[Any, List[Any]], src: Any) -> List[Any]:
     return out
 
 
-def bfs_graph(graph: Dict[Any, List[Any]], src: Any) -> List[Any]:
+def bfs_graph(graph: Graph, src: Any) -> List[Any]:
+    if isinstance(graph, CSRGraph):
+        src_id = graph.index.get(src)
+        if src_id is None:
+            return [src]
+        offsets, targets = graph.offsets, graph.targets
+        seen = bytearray(graph.num_vertices)
+        seen[src_id] = 1
+        # The output list doubles as the queue: ids are appended in BFS order
+        order = [src_id]
+        head = 0
+        while head < len(order):
+            node = order[head]
+            head += 1
+            for nei in targets[offsets[node]:offsets[node + 1]]:
+                if not seen[nei]:
+                    seen[nei] = 1
+                    order.append(nei)
+        labels = graph.labels
+        return [labels[i] for i in order]
     visited: Set[Any] = {src}
     q = deque([src])
     out: List[Any] = []
@@ -164,10 +542,455 @@ def bfs_graph(graph: Dict[Any, List[Any]], src: Any) -> List[Any]:
     return out
 
 
+# -------------------------
+# Lazy (generator) traversals
+# -------------------------
+# Each iterator keeps only an explicit stack or queue, so deep trees and long
+# chains never hit the recursion limit, and callers can stop early by simply
+# not asking for more. `prune(node)` returning True yields the node but skips
+# everything below it.
+Prune = Optional[Callable[[Any], bool]]
+
+
+def iter_preorder(root: Optional[TreeNode], prune: Prune = None) -> Iterator[Any]:
+    stack = [root] if root else []
+    while stack:
+        node = stack.pop()
+        yield node.val
+        if prune is not None and prune(node):
+            continue
+        if node.right:
+            stack.append(node.right)
+        if node.left:
+            stack.append(node.left)
+
+
+def iter_inorder(root: Optional[TreeNode], prune: Prune = None) -> Iterator[Any]:
+    stack: List[TreeNode] = []
+    curr = root
+    while curr or stack:
+        while curr:
+            if prune is not None and prune(curr):
+                break
+            stack.append(curr)
+            curr = curr.left
+        if curr is not None:
+            # A pruned node has no subtrees left to interleave with
+            yield curr.val
+            curr = None
+            continue
+        curr = stack.pop()
+        yield curr.val
+        curr = curr.right
+
+
+def iter_postorder(root: Optional[TreeNode], prune: Prune = None) -> Iterator[Any]:
+    # One stack plus the last emitted node: O(height) instead of two O(n) stacks.
+    # Each entry carries its prune result so prune runs once per node.
+    stack: List[Tuple[TreeNode, bool]] = []
+    last: Optional[TreeNode] = None
+    curr = root
+    while curr or stack:
+        while curr:
+            pruned = prune is not None and prune(curr)
+            stack.append((curr, pruned))
+            curr = None if pruned else curr.left
+        node, pruned = stack[-1]
+        if not pruned and node.right and last != node.right:
+            curr = node.right
+        else:
+            stack.pop()
+            yield node.val
+            last = node
+
+
+def iter_level_order(root: Optional[TreeNode], prune: Prune = None) -> Iterator[Tuple[int, Any]]:
+    """Yield (depth, value) in level order"""
+    q = deque([(0, root)] if root else [])
+    while q:
+        depth, node = q.popleft()
+        yield depth, node.val
+        if prune is not None and prune(node):
+            continue
+        if node.left:
+            q.append((depth + 1, node.left))
+        if node.right:
+            q.append((depth + 1, node.right))
+
+
+def _neighbor_fn(graph: Graph) -> Callable[[Any], List[Any]]:
+    if isinstance(graph, CSRGraph):
+        return graph.neighbors
+    return lambda node: graph.get(node, [])
+
+
+def iter_dfs(graph: Graph, src: Any, prune: Prune = None) -> Iterator[Any]:
+    """Yield nodes in the same order as dfs_recursive, without recursion"""
+    neighbors = _neighbor_fn(graph)
+    visited = {src}
+    yield src
+    if prune is not None and prune(src):
+        return
+    # Stack of neighbour iterators: memory is O(depth), not O(edges)
+    stack = [iter(neighbors(src))]
+    while stack:
+        for nei in stack[-1]:
+            if nei not in visited:
+                visited.add(nei)
+                yield nei
+                if prune is None or not prune(nei):
+                    stack.append(iter(neighbors(nei)))
+                break
+        else:
+            stack.pop()
+
+
+def iter_bfs(graph: Graph, src: Any, prune: Prune = None) -> Iterator[Any]:
+    """Yield nodes in the same order as bfs_graph"""
+    neighbors = _neighbor_fn(graph)
+    visited = {src}
+    q = deque([src])
+    while q:
+        node = q.popleft()
+        yield node
+        if prune is not None and prune(node):
+            continue
+        for nei in neighbors(node):
+            if nei not in visited:
+                visited.add(nei)
+                q.append(nei)
+
+
+# -------------------------
+# Level-synchronous (frontier) BFS
+# -------------------------
+class BFSResult(NamedTuple):
+    order: List[Any]       # labels in visiting order
+    distance: array        # hops from src per vertex id, -1 if unreachable
+    parent: array          # BFS-tree parent id per vertex id, -1 for src/unreachable
+    graph: CSRGraph        # maps ids back to labels via graph.labels / graph.index
+
+
+def bfs_frontier(graph: Graph, src: Any, direction_optimizing: bool = True,
+                 alpha: float = 14.0, beta: float = 24.0) -> BFSResult:
+    """BFS that expands a whole frontier per step, vectorized with NumPy.
+
+    Top-down steps gather every frontier vertex's CSR slice at once, mask by
+    the visited bitmap and deduplicate. With direction_optimizing, large
+    frontiers switch to bottom-up steps, where each unvisited vertex scans
+    its in-edges for a frontier parent (Beamer's alpha/beta heuristic).
+    Levels always match bfs_graph(); the order within a level does too,
+    except after bottom-up steps, which discover vertices in id order.
+    Without NumPy the same algorithm runs on array/bytearray buffers.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_adjacency(graph)
+    n = csr.num_vertices
+    src_id = csr.index.get(src)
+    if src_id is None:
+        return BFSResult([src], array('q'), array('q'), csr)
+
+    distance = array('q', [-1]) * n
+    parent = array('q', [-1]) * n
+    distance[src_id] = 0
+    run = _bfs_frontier_numpy if np is not None else _bfs_frontier_py
+    order = run(csr, src_id, distance, parent, direction_optimizing, alpha, beta)
+    labels = csr.labels
+    return BFSResult([labels[i] for i in order], distance, parent, csr)
+
+
+def _bfs_frontier_py(csr, src_id, distance, parent, direction_optimizing, alpha, beta):
+    n = csr.num_vertices
+    offsets, targets = csr.offsets, csr.targets
+    visited = bytearray(n)
+    visited[src_id] = 1
+    frontier = [src_id]
+    order = [src_id]
+    edges_unexplored = csr.num_edges - (offsets[src_id + 1] - offsets[src_id])
+    bottom_up = False
+    level = 0
+
+    while frontier:
+        level += 1
+        if direction_optimizing:
+            frontier_edges = sum(offsets[v + 1] - offsets[v] for v in frontier)
+            if not bottom_up and frontier_edges > edges_unexplored / alpha:
+                bottom_up = True
+            elif bottom_up and len(frontier) < n / beta:
+                bottom_up = False
+
+        nxt = []
+        if bottom_up:
+            rev = csr.reverse()
+            in_frontier = bytearray(n)
+            for u in frontier:
+                in_frontier[u] = 1
+            for v in range(n):
+                if visited[v]:
+                    continue
+                for u in rev.targets[rev.offsets[v]:rev.offsets[v + 1]]:
+                    if in_frontier[u]:
+                        parent[v] = u
+                        nxt.append(v)
+                        break
+            for v in nxt:
+                visited[v] = 1
+        else:
+            for u in frontier:
+                for v in targets[offsets[u]:offsets[u + 1]]:
+                    if not visited[v]:
+                        visited[v] = 1
+                        parent[v] = u
+                        nxt.append(v)
+
+        for v in nxt:
+            distance[v] = level
+            edges_unexplored -= offsets[v + 1] - offsets[v]
+        order.extend(nxt)
+        frontier = nxt
+    return order
+
+
+def _gather(offsets, targets, vertices):
+    """Concatenate the CSR slices of `vertices`; also return each edge's source"""
+    starts = offsets[vertices]
+    counts = offsets[vertices + 1] - starts
+    total = int(counts.sum())
+    if not total:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    # Position of each gathered edge: its slice start plus its rank in the slice
+    shift = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return targets[shift + np.arange(total)], np.repeat(vertices, counts)
+
+
+def _bfs_frontier_numpy(csr, src_id, distance, parent, direction_optimizing, alpha, beta):
+    n = csr.num_vertices
+    offsets, targets = csr.as_numpy()
+    degree = np.diff(offsets)
+    dist = np.frombuffer(distance, dtype=np.int64)
+    par = np.frombuffer(parent, dtype=np.int64)
+    visited = np.zeros(n, dtype=bool)
+    visited[src_id] = True
+    frontier = np.array([src_id], dtype=np.int64)
+    levels = [frontier]
+    edges_unexplored = int(degree.sum() - degree[src_id])
+    bottom_up = False
+    level = 0
+
+    while frontier.size:
+        level += 1
+        if direction_optimizing:
+            frontier_edges = int(degree[frontier].sum())
+            if not bottom_up and frontier_edges > edges_unexplored / alpha:
+                bottom_up = True
+            elif bottom_up and frontier.size < n / beta:
+                bottom_up = False
+
+        if bottom_up:
+            rev_offsets, rev_targets = csr.reverse().as_numpy()
+            in_frontier = np.zeros(n, dtype=bool)
+            in_frontier[frontier] = True
+            preds, verts = _gather(rev_offsets, rev_targets, np.flatnonzero(~visited))
+            hit = in_frontier[preds]
+            preds, verts = preds[hit], verts[hit]
+            nxt, first = np.unique(verts, return_index=True)
+            par[nxt] = preds[first]
+        else:
+            nbrs, srcs = _gather(offsets, targets, frontier)
+            fresh = ~visited[nbrs]
+            nbrs, srcs = nbrs[fresh], srcs[fresh]
+            # First occurrence wins, which keeps queue-BFS discovery order
+            _, first = np.unique(nbrs, return_index=True)
+            first.sort()
+            nxt = nbrs[first]
+            par[nxt] = srcs[first]
+
+        visited[nxt] = True
+        dist[nxt] = level
+        edges_unexplored -= int(degree[nxt].sum())
+        levels.append(nxt)
+        frontier = nxt
+    return np.concatenate(levels).tolist()
+
+
+# -------------------------
+# Multi-source BFS over a process pool
+# -------------------------
+# Per-worker view of the shared CSR arrays, set by _attach_shared_graph
+_shared_graph: Dict[str, Any] = {}
+
+
+def _bfs_ids(offsets, targets, n: int, src_id: int, metric: str):
+    """Single-source BFS over raw int64 buffers, reduced to `metric`"""
+    distance = array('i', [-1]) * n
+    distance[src_id] = 0
+    order = [src_id]
+    head = 0
+    while head < len(order):
+        node = order[head]
+        head += 1
+        d = distance[node] + 1
+        for nei in targets[offsets[node]:offsets[node + 1]]:
+            if distance[nei] < 0:
+                distance[nei] = d
+                order.append(nei)
+    if metric == 'distance':
+        return distance
+    if metric == 'order':
+        return array('q', order)
+    return len(order), sum(distance[v] for v in order)
+
+
+def _attach_shared_graph(n: int, offsets_name: str, targets_name: str, num_edges: int) -> None:
+    # Pool workers share the parent's resource tracker, and the parent
+    # unlinks the segments, so workers only attach
+    blocks = [shared_memory.SharedMemory(name=name) for name in (offsets_name, targets_name)]
+    _shared_graph['blocks'] = blocks
+    _shared_graph['n'] = n
+    _shared_graph['offsets'] = blocks[0].buf.cast('q')[:n + 1]
+    _shared_graph['targets'] = blocks[1].buf.cast('q')[:num_edges]
+
+
+def _bfs_shared_batch(task):
+    src_ids, metric = task
+    g = _shared_graph
+    return [_bfs_ids(g['offsets'], g['targets'], g['n'], s, metric) for s in src_ids]
+
+
+def bfs_many(graph: Graph, sources: Iterable[Any], workers: Optional[int] = None,
+             metric: str = 'distance', chunk_size: int = 16) -> List[Any]:
+    """BFS from many sources at once, fanned out over a process pool.
+
+    The CSR arrays are copied once into multiprocessing.shared_memory and
+    every worker maps them directly, so the graph is never pickled. Results
+    come back in `sources` order, one per source, reduced by `metric`:
+
+    - 'distance': array('i') of hop counts per vertex id (-1 if unreachable)
+    - 'order':    array('q') of vertex ids in BFS order
+    - 'reach':    (vertices reached, sum of distances), e.g. for closeness
+    """
+    if metric not in ('distance', 'order', 'reach'):
+        raise ValueError("metric must be 'distance', 'order' or 'reach'")
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_adjacency(graph)
+    src_ids = []
+    for s in sources:
+        if s not in csr.index:
+            raise KeyError(f"source {s!r} is not a vertex of the graph")
+        src_ids.append(csr.index[s])
+    n = csr.num_vertices
+    workers = (os.cpu_count() or 1) if workers is None else workers
+
+    if workers <= 1 or len(src_ids) <= 1:
+        return [_bfs_ids(csr.offsets, csr.targets, n, s, metric) for s in src_ids]
+
+    blocks = []
+    try:
+        for arr in (csr.offsets, csr.targets):
+            # SharedMemory rejects size 0, so always reserve at least one slot
+            block = shared_memory.SharedMemory(create=True, size=max(len(arr), 1) * 8)
+            block.buf[:len(arr) * 8] = arr.tobytes()
+            blocks.append(block)
+        tasks = [(src_ids[i:i + chunk_size], metric) for i in range(0, len(src_ids), chunk_size)]
+        init_args = (n, blocks[0].name, blocks[1].name, csr.num_edges)
+        with multiprocessing.Pool(workers, initializer=_attach_shared_graph, initargs=init_args) as pool:
+            results = []
+            for batch in pool.imap(_bfs_shared_batch, tasks):
+                results.extend(batch)
+        return results
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+# -------------------------
+# Async BFS for neighbours that come from I/O
+# -------------------------
+async def async_bfs(get_neighbors: Callable[[Any], Any], src: Any, concurrency: int = 16,
+                    get_neighbors_batch: Optional[Callable[[List[Any]], Any]] = None,
+                    batch_size: int = 64) -> List[Any]:
+    """BFS visit order (same as bfs_graph) when neighbour lists are fetched by coroutines.
+
+    Each level's frontier is fetched at once with asyncio.gather, with at most
+    `concurrency` requests outstanding. A vertex is marked seen when it is
+    discovered, so it is requested exactly once even if several parents in
+    the frontier point at it. If `get_neighbors_batch` is given, it is called
+    with up to `batch_size` vertices at a time and must return their
+    neighbour lists in the same order, or a dict keyed by vertex.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(node):
+        async with semaphore:
+            return await get_neighbors(node)
+
+    async def fetch_batch(nodes):
+        async with semaphore:
+            result = await get_neighbors_batch(nodes)
+        if isinstance(result, dict):
+            return [result.get(node, ()) for node in nodes]
+        return result
+
+    visited: Set[Any] = {src}
+    out: List[Any] = [src]
+    frontier = [src]
+    while frontier:
+        if get_neighbors_batch is None:
+            neighbor_lists = await asyncio.gather(*(fetch(node) for node in frontier))
+        else:
+            batches = await asyncio.gather(*(fetch_batch(frontier[i:i + batch_size])
+                                             for i in range(0, len(frontier), batch_size)))
+            neighbor_lists = [nbrs for batch in batches for nbrs in batch]
+        next_frontier = []
+        for nbrs in neighbor_lists:
+            for nei in nbrs:
+                if nei not in visited:
+                    visited.add(nei)
+                    out.append(nei)
+                    next_frontier.append(nei)
+        frontier = next_frontier
+    return out
+
+
+class StubNeighborService:
+    """In-process stand-in for a remote adjacency store, with injected latency.
+
+    `get` and `get_batch` sleep `latency` seconds per call, so async_bfs can
+    be exercised and timed without a real service. `calls` counts requests
+    and `peak_in_flight` records the most concurrent ones seen.
+    """
+
+    def __init__(self, graph: Dict[Any, List[Any]], latency: float = 0.01):
+        self.graph = graph
+        self.latency = latency
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def _round_trip(self):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+
+    async def get(self, node: Any) -> List[Any]:
+        await self._round_trip()
+        return list(self.graph.get(node, []))
+
+    async def get_batch(self, nodes: List[Any]) -> Dict[Any, List[Any]]:
+        await self._round_trip()
+        return {node: list(self.graph.get(node, [])) for node in nodes}
+
+
 # -------------------------
 # Linked list traversal
 # -------------------------
 class ListNode:
+    __slots__ = ('val', 'next')
+
     def __init__(self, val: Any, nxt: Optional["ListNode"] = None):
         self.val = val
         self.next = nxt
@@ -185,6 +1008,179 @@ def traverse_linked_list(head: Optional[ListNode]) -> List[Any]:
     return out
 
 
+# -------------------------
+# Node pools (structure of arrays)
+# -------------------------
+# A pool stores every node's value in one list and its links as int64
+# indexes (-1 for None) in flat arrays, so a node costs a list slot and a
+# few array cells instead of a Python object. Handles expose the same
+# .val/.left/.right (or .val/.next) attributes as the node classes, so the
+# traversal and two-pointer functions accept them unchanged.
+_NIL = -1
+
+
+class TreeHandle:
+    __slots__ = ('pool', 'index')
+
+    def __init__(self, pool: "TreePool", index: int):
+        self.pool = pool
+        self.index = index
+
+    @property
+    def val(self) -> Any:
+        return self.pool.vals[self.index]
+
+    @val.setter
+    def val(self, value: Any) -> None:
+        self.pool.vals[self.index] = value
+
+    @property
+    def left(self) -> Optional["TreeHandle"]:
+        return self.pool.handle(self.pool.lefts[self.index])
+
+    @left.setter
+    def left(self, node: Optional["TreeHandle"]) -> None:
+        self.pool.lefts[self.index] = _NIL if node is None else node.index
+
+    @property
+    def right(self) -> Optional["TreeHandle"]:
+        return self.pool.handle(self.pool.rights[self.index])
+
+    @right.setter
+    def right(self, node: Optional["TreeHandle"]) -> None:
+        self.pool.rights[self.index] = _NIL if node is None else node.index
+
+    def __eq__(self, other):
+        return isinstance(other, TreeHandle) and other.index == self.index and other.pool is self.pool
+
+    def __hash__(self):
+        return hash((id(self.pool), self.index))
+
+    def __repr__(self):
+        return f"TreeNode({self.val})"
+
+
+class TreePool:
+    """Binary tree nodes stored as parallel arrays"""
+
+    def __init__(self):
+        self.vals: List[Any] = []
+        self.lefts = array('q')
+        self.rights = array('q')
+
+    def __len__(self) -> int:
+        return len(self.vals)
+
+    def pop(self) -> None:
+        """Drop the most recently created node"""
+        self.vals.pop()
+        self.lefts.pop()
+        self.rights.pop()
+
+    def handle(self, index: int) -> Optional[TreeHandle]:
+        return None if index == _NIL else TreeHandle(self, index)
+
+    def new(self, val: Any, left: Optional[TreeHandle] = None, right: Optional[TreeHandle] = None) -> TreeHandle:
+        self.vals.append(val)
+        self.lefts.append(_NIL if left is None else left.index)
+        self.rights.append(_NIL if right is None else right.index)
+        return TreeHandle(self, len(self.vals) - 1)
+
+    @classmethod
+    def from_tree(cls, root: Optional[TreeNode]) -> Tuple["TreePool", Optional[TreeHandle]]:
+        """Copy a TreeNode tree into a new pool; returns (pool, root handle)"""
+        pool = cls()
+        if root is None:
+            return pool, None
+        # Preorder numbering: a node's index is assigned before its children's
+        index_of = {}
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            index_of[id(node)] = len(pool.vals)
+            pool.vals.append(node.val)
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
+        pool.lefts = array('q', [_NIL]) * len(pool.vals)
+        pool.rights = array('q', [_NIL]) * len(pool.vals)
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            i = index_of[id(node)]
+            if node.left:
+                pool.lefts[i] = index_of[id(node.left)]
+                stack.append(node.left)
+            if node.right:
+                pool.rights[i] = index_of[id(node.right)]
+                stack.append(node.right)
+        return pool, pool.handle(0)
+
+
+class ListHandle:
+    __slots__ = ('pool', 'index')
+
+    def __init__(self, pool: "ListPool", index: int):
+        self.pool = pool
+        self.index = index
+
+    @property
+    def val(self) -> Any:
+        return self.pool.vals[self.index]
+
+    @val.setter
+    def val(self, value: Any) -> None:
+        self.pool.vals[self.index] = value
+
+    @property
+    def next(self) -> Optional["ListHandle"]:
+        return self.pool.handle(self.pool.nexts[self.index])
+
+    @next.setter
+    def next(self, node: Optional["ListHandle"]) -> None:
+        self.pool.nexts[self.index] = _NIL if node is None else node.index
+
+    def __eq__(self, other):
+        return isinstance(other, ListHandle) and other.index == self.index and other.pool is self.pool
+
+    def __hash__(self):
+        return hash((id(self.pool), self.index))
+
+    def __repr__(self):
+        return f"ListNode({self.val})"
+
+
+class ListPool:
+    """Singly linked list nodes stored as parallel arrays"""
+
+    def __init__(self):
+        self.vals: List[Any] = []
+        self.nexts = array('q')
+
+    def __len__(self) -> int:
+        return len(self.vals)
+
+    def handle(self, index: int) -> Optional[ListHandle]:
+        return None if index == _NIL else ListHandle(self, index)
+
+    def new(self, val: Any, nxt: Optional[ListHandle] = None) -> ListHandle:
+        self.vals.append(val)
+        self.nexts.append(_NIL if nxt is None else nxt.index)
+        return ListHandle(self, len(self.vals) - 1)
+
+    @classmethod
+    def from_values(cls, values: Iterable[Any]) -> Tuple["ListPool", Optional[ListHandle]]:
+        """Build a list holding `values` in order; returns (pool, head handle)"""
+        pool = cls()
+        pool.vals = list(values)
+        n = len(pool.vals)
+        pool.nexts = array('q', range(1, n + 1))
+        if n:
+            pool.nexts[-1] = _NIL
+        return pool, pool.handle(0 if n else _NIL)
+
+
 # -------------------------
 # Filesystem traversal
 # -------------------------
@@ -200,23 +1196,285 @@ def traverse_os_walk(start_path: str, max_items: int = 20) -> List[str]:
 
 
 def traverse_manual_stack(start_path: str, max_items: int = 20) -> List[str]:
-    """Manual DFS using a stack with os.listdir."""
+    """Manual DFS using a stack with os.scandir."""
     found: List[str] = []
-    stack = [start_path]
+    # (path, is_dir) pairs; scandir's d_type saves an isdir() call per entry
+    stack = [(start_path, os.path.isdir(start_path))]
     while stack and len(found) < max_items:
-        path = stack.pop()
+        path, is_dir = stack.pop()
         found.append(path)
-        if os.path.isdir(path):
+        if is_dir:
             try:
-                entries = [os.path.join(path, e) for e in os.listdir(path)]
+                with os.scandir(path) as it:
+                    entries = [(e.path, e.is_dir()) for e in it]
             except PermissionError:
                 continue
             # push in reversed order to visit lexicographically
-            for e in sorted(entries, reverse=True):
-                stack.append(e)
+            entries.sort(reverse=True)
+            stack.extend(entries)
     return found
 
 
+class FileRecord(NamedTuple):
+    path: str
+    size: int
+    mtime: float
+    is_dir: bool
+
+
+def _glob_matcher(patterns: Optional[Iterable[str]]) -> Optional[Callable[[str], Optional[re.Match]]]:
+    """One compiled regex for a set of fnmatch-style globs (None if no patterns)"""
+    if not patterns:
+        return None
+    return re.compile('|'.join(fnmatch.translate(p) for p in patterns)).match
+
+
+def _scan_dir(path: str, rel: str, follow_symlinks: bool, onerror: Optional[Callable[[OSError], Any]]):
+    """Scan one directory; returns ([(rel path, FileRecord)], [(path, rel path, dir key)])"""
+    records = []
+    subdirs = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    st = entry.stat(follow_symlinks=follow_symlinks)
+                except OSError as err:
+                    # Dangling symlink or entry removed mid-scan
+                    if onerror is not None:
+                        onerror(err)
+                    continue
+                is_dir = stat.S_ISDIR(st.st_mode)
+                entry_rel = entry.name if not rel else rel + os.sep + entry.name
+                records.append((entry_rel, FileRecord(entry.path, st.st_size, st.st_mtime, is_dir)))
+                if is_dir:
+                    subdirs.append((entry.path, entry_rel, (st.st_dev, st.st_ino)))
+    except OSError as err:
+        if onerror is not None:
+            onerror(err)
+    return records, subdirs
+
+
+def crawl_fs(start_path: str, workers: int = 8, include: Optional[Iterable[str]] = None,
+             exclude: Optional[Iterable[str]] = None, follow_symlinks: bool = False,
+             onerror: Optional[Callable[[OSError], Any]] = None) -> Iterator[FileRecord]:
+    """Stream FileRecords for start_path and everything below it, scanning directories on a thread pool.
+
+    Globs match either an entry's name or its path relative to start_path.
+    `exclude` prunes matching files and whole directories; `include`, when
+    given, limits which records are yielded but not which directories are
+    searched. Directories are tracked by (st_dev, st_ino), so followed
+    symlinks can never loop. At most 2 * workers directory listings are
+    buffered at once, and the walk stops as soon as the consumer does.
+    Order is not deterministic.
+    """
+    wanted = _glob_matcher(include)
+    unwanted = _glob_matcher(exclude)
+
+    def keep(rel: str, name: str, matcher) -> bool:
+        return bool(matcher(name) or matcher(rel))
+
+    try:
+        st = os.stat(start_path) if follow_symlinks else os.lstat(start_path)
+    except OSError as err:
+        if onerror is not None:
+            onerror(err)
+        return
+    root = FileRecord(start_path, st.st_size, st.st_mtime, stat.S_ISDIR(st.st_mode))
+    if wanted is None or keep('', os.path.basename(start_path), wanted):
+        yield root
+    if not root.is_dir:
+        return
+
+    seen = {(st.st_dev, st.st_ino)}
+    # Depth-first work list keeps the backlog of unscanned directories short
+    pending = [(start_path, '')]
+    max_in_flight = 2 * workers
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        in_flight = set()
+        try:
+            while pending or in_flight:
+                while pending and len(in_flight) < max_in_flight:
+                    path, rel = pending.pop()
+                    in_flight.add(pool.submit(_scan_dir, path, rel, follow_symlinks, onerror))
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    records, subdirs = future.result()
+                    for rel, record in records:
+                        name = rel.rpartition(os.sep)[2]
+                        if unwanted is not None and keep(rel, name, unwanted):
+                            continue
+                        if wanted is None or keep(rel, name, wanted):
+                            yield record
+                    for path, rel, key in subdirs:
+                        if key in seen:
+                            continue
+                        if unwanted is not None and keep(rel, rel.rpartition(os.sep)[2], unwanted):
+                            continue
+                        seen.add(key)
+                        pending.append((path, rel))
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+
+# -------------------------
+# Incremental filesystem index
+# -------------------------
+# A directory's mtime changes whenever an entry is added to, removed from or
+# renamed within it, so a re-scan lists only directories whose mtime moved.
+# Unchanged directories cost one stat() each: their known subdirectories are
+# read back from the index instead of from disk. Editing a file in place
+# does not touch its directory's mtime, so those edits are only caught for
+# files in re-listed directories, or by a full=True re-scan.
+class FSDiff(NamedTuple):
+    added: List[str]
+    removed: List[str]
+    modified: List[str]
+
+
+class FSIndex:
+    """Persistent snapshot of one directory tree, stored in sqlite"""
+
+    def __init__(self, db_path: str):
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                path TEXT PRIMARY KEY,
+                parent TEXT,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                is_dir INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS entries_parent ON entries (parent);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        """)
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'root'").fetchone()
+        self.root: Optional[str] = row[0] if row else None
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def get(self, path: str) -> Optional[FileRecord]:
+        row = self.conn.execute("SELECT path, size, mtime, is_dir FROM entries WHERE path = ?", (path,)).fetchone()
+        return FileRecord(row[0], row[1], row[2], bool(row[3])) if row else None
+
+    def _children(self, path: str, dirs_only: bool = False) -> Dict[str, FileRecord]:
+        query = "SELECT path, size, mtime, is_dir FROM entries WHERE parent = ?"
+        if dirs_only:
+            query += " AND is_dir = 1"
+        return {row[0]: FileRecord(row[0], row[1], row[2], bool(row[3]))
+                for row in self.conn.execute(query, (path,))}
+
+    def _drop_subtree(self, path: str, removed: List[str]) -> None:
+        """Forget everything strictly below path, reporting it as removed"""
+        # Keys between "path/" and "path0" are exactly path's descendants
+        bounds = (path + os.sep, path + chr(ord(os.sep) + 1))
+        removed.extend(row[0] for row in self.conn.execute(
+            "SELECT path FROM entries WHERE path >= ? AND path < ?", bounds))
+        self.conn.execute("DELETE FROM entries WHERE path >= ? AND path < ?", bounds)
+
+    def scan(self, root: Optional[str] = None, workers: int = 8, full: bool = False,
+             onerror: Optional[Callable[[OSError], Any]] = None) -> FSDiff:
+        """Bring the index up to date with the tree on disk and return what changed.
+
+        The first scan records everything as added. `full=True` re-lists every
+        directory, which also catches files edited in place.
+        """
+        if root is None:
+            root = self.root
+        if root is None:
+            raise ValueError("the first scan needs a root directory")
+        root = os.path.abspath(root)
+        if self.root is not None and root != self.root:
+            raise ValueError(f"index was built for {self.root!r}, not {root!r}")
+
+        diff = FSDiff([], [], [])
+        with self.conn:
+            if self.root is None:
+                self.conn.execute("INSERT INTO meta VALUES ('root', ?)", (root,))
+                self.root = root
+            try:
+                st = os.stat(root)
+            except OSError as err:
+                if onerror is not None:
+                    onerror(err)
+                return diff
+            stored = self.get(root)
+            if stored is None:
+                self._apply(None, FileRecord(root, st.st_size, st.st_mtime, True), None, diff)
+
+            # Level-synchronous walk: probe a frontier of (path, stored mtime)
+            # directories on the thread pool, then reconcile in this thread
+            frontier = [(root, None if full or stored is None else stored.mtime)]
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                while frontier:
+                    next_frontier = []
+                    probes = pool.map(lambda item: _probe_dir(item[0], item[1], onerror), frontier)
+                    for (path, _), (mtime, listing) in zip(frontier, probes):
+                        if mtime is None:
+                            continue  # vanished mid-scan; its parent's next re-list drops it
+                        if listing is None:
+                            for child in self._children(path, dirs_only=True).values():
+                                next_frontier.append((child.path, None if full else child.mtime))
+                            continue
+                        next_frontier.extend(self._reconcile(path, mtime, listing, full, diff))
+                    frontier = next_frontier
+        return diff
+
+    def _apply(self, parent: Optional[str], record: FileRecord, old: Optional[FileRecord], diff: FSDiff) -> None:
+        """Store one entry, noting it in diff if it is new or (for files) changed"""
+        if old is None:
+            diff.added.append(record.path)
+        elif old.is_dir != record.is_dir or (not record.is_dir and (old.size, old.mtime) != (record.size, record.mtime)):
+            diff.modified.append(record.path)
+        self.conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                          (record.path, parent, record.size, record.mtime, int(record.is_dir)))
+
+    def _reconcile(self, path: str, mtime: float, listing: List[FileRecord], full: bool, diff: FSDiff):
+        """Diff a fresh listing against the index; returns the subdirectories to visit next"""
+        known = self._children(path)
+        subdirs = []
+        for record in listing:
+            old = known.pop(record.path, None)
+            if old is not None and old.is_dir and not record.is_dir:
+                self._drop_subtree(record.path, diff.removed)
+            self._apply(path, record, old, diff)
+            if record.is_dir:
+                # A directory that is new, or used to be a file, is listed unconditionally
+                fresh = full or old is None or not old.is_dir
+                subdirs.append((record.path, None if fresh else old.mtime))
+        for gone in known.values():
+            diff.removed.append(gone.path)
+            self.conn.execute("DELETE FROM entries WHERE path = ?", (gone.path,))
+            if gone.is_dir:
+                self._drop_subtree(gone.path, diff.removed)
+        self.conn.execute("UPDATE entries SET mtime = ? WHERE path = ?", (mtime, path))
+        return subdirs
+
+
+def _probe_dir(path: str, known_mtime: Optional[float], onerror: Optional[Callable[[OSError], Any]]):
+    """(mtime, listing) for a directory, with listing None if its mtime equals known_mtime"""
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError as err:
+        if onerror is not None:
+            onerror(err)
+        return None, None
+    if mtime == known_mtime:
+        return mtime, None
+    records, _ = _scan_dir(path, '', False, onerror)
+    return mtime, [record for _, record in records]
+
+
 # -------------------------
 # Demo / simple tests
 # -------------------------
@@ -262,18 +1520,48 @@ if __name__ == "__main__":
     print("Inorder iterative:", inorder_iterative(tree))
     print("Postorder iterative:", postorder_iterative(tree))
     print("Level-order (BFS):", level_order_bfs(tree))
+    print("Lazy postorder:", list(iter_postorder(tree)))
+    print("Morris inorder / preorder / postorder:",
+          morris_inorder(tree), morris_preorder(tree), morris_postorder(tree))
+    print("Lazy preorder, pruning below 2:", list(iter_preorder(tree, prune=lambda n: n.val == 2)))
 
     # Graph demos
     g = _build_sample_graph()
     print("DFS recursive:", dfs_recursive(g, "A"))
     print("DFS iterative:", dfs_iterative(g, "A"))
     print("BFS graph:", bfs_graph(g, "A"))
+    print("Lazy DFS, first 3:", list(itertools.islice(iter_dfs(g, "A"), 3)))
+    csr = CSRGraph.from_adjacency(g)
+    print("CSR DFS recursive:", dfs_recursive(csr, "A"))
+    print("CSR DFS iterative:", dfs_iterative(csr, "A"))
+    print("CSR BFS:", bfs_graph(csr, "A"))
+    frontier_result = bfs_frontier(csr, "A")
+    print("Frontier BFS:", frontier_result.order,
+          "distances:", {label: frontier_result.distance[i] for i, label in enumerate(csr.labels)})
+    print("Reach from every vertex:", dict(zip(csr.labels, bfs_many(csr, csr.labels, workers=2, metric='reach'))))
+    service = StubNeighborService(g, latency=0.01)
+    print("Async BFS:", asyncio.run(async_bfs(service.get, "A", concurrency=4)),
+          "requests:", service.calls, "peak in flight:", service.peak_in_flight)
 
     # Linked list demo
     ll = _build_linked_list()
     print("Linked list traverse:", traverse_linked_list(ll))
+    _, pooled_head = ListPool.from_values([1, 2, 3])
+    print("Pooled linked list traverse:", traverse_linked_list(pooled_head))
+    _, pooled_tree = TreePool.from_tree(tree)
+    print("Pooled tree inorder / Morris postorder:", inorder_iterative(pooled_tree), morris_postorder(pooled_tree))
 
     # Filesystem demo (current directory; safe small output)
     cwd = os.getcwd()
     print("os.walk sample (cwd):", traverse_os_walk(cwd, max_items=6))
-    print("manual stack DFS (cwd):", traverse_manual_stack(cwd, max_items=6))
\ No newline at end of file
+    print("manual stack DFS (cwd):", traverse_manual_stack(cwd, max_items=6))
+    py_files = [r for r in crawl_fs(cwd, workers=4, include=["*.py"], exclude=[".git"]) if not r.is_dir]
+    print("parallel crawl (cwd) *.py files:", len(py_files), "bytes:", sum(r.size for r in py_files))
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, "tree", "sub"))
+        with FSIndex(os.path.join(tmp, "index.db")) as index:
+            first = index.scan(os.path.join(tmp, "tree"))
+            open(os.path.join(tmp, "tree", "sub", "new.txt"), "w").close()
+            second = index.scan()
+        print("FS index: first scan added", len(first.added), "entries; re-scan diff:",
+              [os.path.relpath(p, tmp) for p in second.added], second.removed, second.modified)